@@ -1,20 +1,46 @@
 """Main module for token usage analyzer."""
 
+import argparse
 import json
 import datetime
+import functools
+import heapq
+import itertools
 import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
 from config import (
     DEFAULT_MODEL_COSTS,
     CALCULATION_MODE,
     DEFAULT_EXPORT_FORMAT,
     REPORT_DIRECTORY,
     EXPORT_FORMATS,
+    ANALYSIS_WORKERS,
+    PARALLEL_ANALYSIS_THRESHOLD,
+)
+from loaders import load_conversations, iter_conversations
+from filters import filter_conversations, parse_date_bounds
+from analyzers import (
+    analyze_conversation_tokens_and_costs,
+    identify_model_from_metadata,
 )
-from loaders import load_conversations
-from filters import filter_conversations_by_date, filter_conversations_by_model
-from analyzers import analyze_conversation_tokens_and_costs
 from reporting import generate_comprehensive_report, print_report_to_console
-from message_ordering import get_message_chronological_order
+from message_ordering import (
+    get_cached_message_order,
+    get_message_chronological_order,
+)
+
+# Characters replaced when turning a conversation title into a filename. \w follows
+# str.isalnum() (plus "_") for non-ASCII text, so accented titles are kept readable.
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
 
 
 def count_real_turns_in_conversation(original_conv):
@@ -32,24 +58,14 @@ def count_real_turns_in_conversation(original_conv):
     if not mapping:
         return 0
 
-    # Get messages in chronological order
-    ordered_message_ids = get_message_chronological_order(mapping)
-    if not ordered_message_ids:
-        return 0
-
-    turn_count = 0
-    for msg_id in ordered_message_ids:
-        msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
-            continue
-
-        message = msg_data["message"]
-
-        # Check if this message ends a turn
-        if message.get("end_turn") is True:
-            turn_count += 1
-
-    return turn_count
+    # Count messages (in chronological order) that end a turn
+    return sum(
+        1
+        for msg_id in get_cached_message_order(mapping)
+        if (msg_data := mapping.get(msg_id))
+        and (message := msg_data.get("message"))
+        and message.get("end_turn") is True
+    )
 
 
 def find_conversations_with_most_turns(analysis_results, limit=10):
@@ -57,26 +73,49 @@ def find_conversations_with_most_turns(analysis_results, limit=10):
     # Filter out conversations with errors
     valid_results = [result for result in analysis_results if "error" not in result]
 
-    # Sort conversations by turn count
+    # Pick the turn count field to rank by
     if valid_results and "real_turns_count" in valid_results[0]:
         # Use real turn count when available
-        sorted_convs = sorted(
-            valid_results, key=lambda x: x.get("real_turns_count", 0), reverse=True
-        )
+        sort_field = "real_turns_count"
     elif valid_results and "assistant_messages_count" in valid_results[0]:
         # For detailed mode, fall back to assistant message count if real turns not available
-        sorted_convs = sorted(
-            valid_results,
-            key=lambda x: x.get("assistant_messages_count", 0),
-            reverse=True,
-        )
+        sort_field = "assistant_messages_count"
     else:
         # For simple mode - use message count as proxy for turns
-        sorted_convs = sorted(
-            valid_results, key=lambda x: x.get("message_count", 0), reverse=True
-        )
+        sort_field = "message_count"
+
+    # Select the top entries without sorting everything (ties keep input order).
+    # Results of one analysis run share their keys, so the field is always present.
+    return heapq.nlargest(limit, valid_results, key=itemgetter(sort_field))
 
-    return sorted_convs[:limit]
+
+# Most recently indexed (analysis_results, result count, title index), reused across searches
+_title_index_cache = (None, 0, [])
+
+
+def _index_titles(analysis_results):
+    """
+    Build a list of (conversation, casefolded title) pairs for case-insensitive search.
+
+    The index for the most recently searched result list is cached, so repeated
+    searches from the interactive menu only casefold each title once.
+
+    Args:
+        analysis_results: List of analysis results for each conversation
+
+    Returns:
+        List of (analysis result, casefolded title) pairs, skipping untitled ones
+    """
+    global _title_index_cache
+    cached_results, cached_count, index = _title_index_cache
+    if cached_results is not analysis_results or cached_count != len(analysis_results):
+        index = [
+            (conv, title.casefold())
+            for conv in analysis_results
+            if (title := conv.get("title", ""))
+        ]
+        _title_index_cache = (analysis_results, len(analysis_results), index)
+    return index
 
 
 def find_conversations_by_title(analysis_results, title_query, case_sensitive=False):
@@ -91,21 +130,16 @@ def find_conversations_by_title(analysis_results, title_query, case_sensitive=Fa
     Returns:
         List of conversations that match the title query
     """
-    matching_conversations = []
+    if case_sensitive:
+        return [
+            conv
+            for conv in analysis_results
+            if (title := conv.get("title", "")) and title_query in title
+        ]
 
-    for conv in analysis_results:
-        title = conv.get("title", "")
-        if not title:
-            continue
-
-        if case_sensitive:
-            if title_query in title:
-                matching_conversations.append(conv)
-        else:
-            if title_query.lower() in title.lower():
-                matching_conversations.append(conv)
-
-    return matching_conversations
+    # Casefold the query once and match it against the prebuilt title index
+    query = title_query.casefold()
+    return [conv for conv, title in _index_titles(analysis_results) if query in title]
 
 
 def extract_message_content(message):
@@ -123,8 +157,13 @@ def extract_message_content(message):
     # Handle different content types
     parts = content.get("parts", [])
     if parts:
+        # Most messages have a single part, which needs no joining
+        if len(parts) == 1:
+            part = parts[0]
+            return str(part) if part else ""
+
         # Join multiple parts with newlines
-        return "\n".join([str(part) for part in parts if part])
+        return "\n".join(map(str, filter(None, parts)))
 
     # Handle other content types if needed
     text = content.get("text", "")
@@ -150,24 +189,28 @@ def display_conversation_text(original_conv):
         return
 
     # Get messages in chronological order
-    ordered_message_ids = get_message_chronological_order(mapping)
+    ordered_message_ids = get_cached_message_order(mapping)
 
     if not ordered_message_ids:
         print("Error: Could not determine message order.")
         return
 
-    print(f"\n{'='*80}")
-    print(f"CONVERSATION: {title}")
-    print(f"{'='*80}")
+    # Collect the transcript's lines and print them in one call
+    lines = []
+    out = lines.append
+
+    out(f"\n{'='*80}")
+    out(f"CONVERSATION: {title}")
+    out(f"{'='*80}")
 
     current_turn = 1
 
     for msg_id in ordered_message_ids:
         msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
+        message = msg_data.get("message") if msg_data else None
+        if not message:
             continue
 
-        message = msg_data["message"]
         author = message.get("author", {})
         role = author.get("role", "unknown")
         name = author.get("name", role.capitalize())
@@ -185,18 +228,48 @@ def display_conversation_text(original_conv):
         # Format role name with padding
         role_display = f"[{name}{model_info}]"
 
-        print(f"\n{role_display}")
-        print(f"{'-' * len(role_display)}")
-        print(content)
+        out(f"\n{role_display}")
+        out(f"{'-' * len(role_display)}")
+        out(str(content))
 
         # Mark turn boundaries
         if message.get("end_turn") is True:
-            print(f"\n----- End of Turn {current_turn} -----")
+            out(f"\n----- End of Turn {current_turn} -----")
             current_turn += 1
 
-    print(f"\n{'='*80}")
-    print(f"Total turns: {current_turn - 1}")
-    print(f"{'='*80}\n")
+    out(f"\n{'='*80}")
+    out(f"Total turns: {current_turn - 1}")
+    out(f"{'='*80}\n")
+    print("\n".join(lines))
+
+
+# Most recently built (original_data, index) pair, reused while the same dataset is browsed
+_originals_index_cache = (None, {})
+
+
+def _index_originals(original_data):
+    """
+    Build a mapping from conversation ID to original conversation data.
+
+    The index for the most recently seen dataset is cached, so repeated calls
+    from the interactive menus reuse it instead of rescanning original_data.
+
+    Args:
+        original_data: Original conversation data
+
+    Returns:
+        Dictionary mapping conversation IDs to conversations
+    """
+    global _originals_index_cache
+    if _originals_index_cache[0] is not original_data:
+        index = {}
+        for conv in original_data:
+            conv_id = conv.get("id")
+            if conv_id:
+                # Keep the first occurrence, matching a front-to-back scan
+                index.setdefault(conv_id, conv)
+        _originals_index_cache = (original_data, index)
+    return _originals_index_cache[1]
 
 
 def find_original_conversation(analysis_result, original_data):
@@ -205,11 +278,7 @@ def find_original_conversation(analysis_result, original_data):
     if not conv_id:
         return None
 
-    for conv in original_data:
-        if conv.get("id") == conv_id:
-            return conv
-
-    return None
+    return _index_originals(original_data).get(conv_id)
 
 
 def export_conversation_to_json(conversation, original_data, output_dir=None):
@@ -228,8 +297,7 @@ def export_conversation_to_json(conversation, original_data, output_dir=None):
         output_dir = REPORT_DIRECTORY
 
     # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
     # Get conversation ID to find the original data
     conv_id = conversation.get("conversation_id")
@@ -238,11 +306,7 @@ def export_conversation_to_json(conversation, original_data, output_dir=None):
         return None
 
     # Find the original conversation data
-    original_conv = None
-    for conv in original_data:
-        if conv.get("id") == conv_id:
-            original_conv = conv
-            break
+    original_conv = _index_originals(original_data).get(conv_id)
 
     if not original_conv:
         print("Error: Could not find original conversation data for export.")
@@ -250,8 +314,8 @@ def export_conversation_to_json(conversation, original_data, output_dir=None):
 
     # Create a sanitized filename from the title
     title = conversation.get("title", "untitled")
-    sanitized_title = "".join(c if c.isalnum() or c in " -_" else "_" for c in title)
-    sanitized_title = sanitized_title[:50]  # Limit length
+    # Each character maps to one character, so limit the length before substituting
+    sanitized_title = _UNSAFE_FILENAME_CHARS.sub("_", title[:50])
 
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{sanitized_title}_{timestamp}.json"
@@ -259,8 +323,12 @@ def export_conversation_to_json(conversation, original_data, output_dir=None):
 
     # Write the conversation data to file
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(original_conv, f, indent=2)
+        if orjson is not None:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(original_conv, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(original_conv, f, indent=2)
         print(f"Conversation exported to: {filepath}")
         return filepath
     except Exception as e:
@@ -274,16 +342,18 @@ def print_conversation_details(conversation, mode="detailed", original_data=None
     print(f"\n=== Conversation Details: {title} ===")
 
     # Format create time if available
-    if conversation.get("create_time_ts"):
-        create_time = datetime.datetime.fromtimestamp(
-            conversation.get("create_time_ts")
-        ).strftime("%Y-%m-%d %H:%M:%S")
+    create_time_ts = conversation.get("create_time_ts")
+    if create_time_ts:
+        create_time = datetime.datetime.fromtimestamp(create_time_ts).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
         print(f"Created: {create_time}")
 
-    if conversation.get("update_time_ts"):
-        update_time = datetime.datetime.fromtimestamp(
-            conversation.get("update_time_ts")
-        ).strftime("%Y-%m-%d %H:%M:%S")
+    update_time_ts = conversation.get("update_time_ts")
+    if update_time_ts:
+        update_time = datetime.datetime.fromtimestamp(update_time_ts).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
         print(f"Updated: {update_time}")
 
     # Display turn count
@@ -354,7 +424,9 @@ def print_top_conversations_by_turns(
     conversations, mode="detailed", original_data=None
 ):
     """Print information about the conversations with the most turns."""
-    print("\n=== Conversations with Most Turns ===")
+    # Collect the table's lines and print them in one call
+    lines = ["\n=== Conversations with Most Turns ==="]
+    out = lines.append
 
     for i, conv in enumerate(conversations, 1):
         title = conv.get("title", "Untitled")
@@ -374,19 +446,16 @@ def print_top_conversations_by_turns(
                 "simple_total_output_tokens", 0
             )
 
-        # Format create time if available
-        create_time = ""
-        if conv.get("create_time_ts"):
-            create_time = datetime.datetime.fromtimestamp(
-                conv.get("create_time_ts")
-            ).strftime("%Y-%m-%d")
+        create_time = conv.get("create_date", "")
 
-        print(f"{i}. {title} ({create_time})")
+        out(f"{i}. {title} ({create_time})")
         if real_turns is not None:
-            print(f"   Actual Turns: {real_turns}")
-        print(f"   Assistant Messages: {assistant_msgs}")
-        print(f"   Total Tokens: {total_tokens:,}")
-        print()
+            out(f"   Actual Turns: {real_turns}")
+        out(f"   Assistant Messages: {assistant_msgs}")
+        out(f"   Total Tokens: {total_tokens:,}")
+        out("")
+
+    print("\n".join(lines))
 
 
 def find_and_display_conversation_by_title(
@@ -412,11 +481,7 @@ def find_and_display_conversation_by_title(
     else:
         for i, conv in enumerate(matching_conversations, 1):
             title = conv.get("title", "Untitled")
-            create_time = ""
-            if conv.get("create_time_ts"):
-                create_time = datetime.datetime.fromtimestamp(
-                    conv.get("create_time_ts")
-                ).strftime("%Y-%m-%d")
+            create_time = conv.get("create_date", "")
 
             real_turns = conv.get("real_turns_count")
             print(f"{i}. {title} ({create_time})")
@@ -444,7 +509,7 @@ def analyze_model_details(all_conversations, model_id):
     Useful for understanding "N/A" or other special model identifiers.
 
     Args:
-        all_conversations: List of all conversation data
+        all_conversations: Iterable of conversation data (a list or a stream)
         model_id: Model identifier to analyze
 
     Returns:
@@ -454,10 +519,10 @@ def analyze_model_details(all_conversations, model_id):
     print(f"DETAILED ANALYSIS FOR MODEL: {model_id}")
     print(f"{'='*80}")
 
-    message_count = 0
-    recipient_types = {}
-    content_types = {}
-    author_roles = {}
+    # Per-message values, tallied into histograms after the scan
+    recipients = []
+    content_type_values = []
+    author_role_values = []
     sample_messages = []
 
     # Loop through all conversations
@@ -466,44 +531,45 @@ def analyze_model_details(all_conversations, model_id):
         if not mapping:
             continue
 
-        # Get messages in chronological order
+        # Find the messages that match the model we're analyzing with one scan of
+        # the mapping, so conversations without the model are never ordered
+        matching_ids = {
+            msg_id
+            for msg_id, msg_data in mapping.items()
+            if msg_data
+            and (message := msg_data.get("message"))
+            and identify_model_from_metadata(message) == model_id
+        }
+        if not matching_ids:
+            continue
+
+        # Get messages in chronological order. Each conversation is visited once
+        # (possibly streamed), so the order is not cached to avoid pinning mappings
         ordered_message_ids = get_message_chronological_order(mapping)
         if not ordered_message_ids:
             continue
 
         for msg_id in ordered_message_ids:
-            msg_data = mapping.get(msg_id)
-            if not msg_data or not msg_data.get("message"):
-                continue
-
-            message = msg_data["message"]
-            metadata = message.get("metadata", {})
-
-            # Check if this message matches the model we're analyzing
-            from analyzers import identify_model_from_metadata
-
-            model_slug = identify_model_from_metadata(message)
-
-            if model_slug == model_id:
-                message_count += 1
+            if msg_id in matching_ids:
+                message = mapping[msg_id]["message"]
 
                 # Collect stats
                 recipient = message.get("recipient", "none")
-                recipient_types[recipient] = recipient_types.get(recipient, 0) + 1
+                recipients.append(recipient)
 
                 content = message.get("content", {})
-                content_type = content.get("content_type", "unknown")
-                content_types[content_type] = content_types.get(content_type, 0) + 1
+                content_type_values.append(content.get("content_type", "unknown"))
 
                 author_role = message.get("author", {}).get("role", "unknown")
-                author_roles[author_role] = author_roles.get(author_role, 0) + 1
+                author_role_values.append(author_role)
 
                 # Collect a few sample messages
                 if len(sample_messages) < 3:
+                    content_str = str(content)
                     sample_content = (
-                        str(content)[:100] + "..."
-                        if len(str(content)) > 100
-                        else str(content)
+                        content_str[:100] + "..."
+                        if len(content_str) > 100
+                        else content_str
                     )
                     sample_messages.append(
                         {
@@ -514,22 +580,23 @@ def analyze_model_details(all_conversations, model_id):
                         }
                     )
 
+    message_count = len(recipients)
+    recipient_types = Counter(recipients)
+    content_types = Counter(content_type_values)
+    author_roles = Counter(author_role_values)
+
     # Print results
     print(f"Total messages with model '{model_id}': {message_count}")
     print("\nMessage recipients:")
-    for recipient, count in sorted(
-        recipient_types.items(), key=lambda x: x[1], reverse=True
-    ):
+    for recipient, count in recipient_types.most_common():
         print(f"  - {recipient}: {count} messages ({count/message_count*100:.1f}%)")
 
     print("\nContent types:")
-    for content_type, count in sorted(
-        content_types.items(), key=lambda x: x[1], reverse=True
-    ):
+    for content_type, count in content_types.most_common():
         print(f"  - {content_type}: {count} messages ({count/message_count*100:.1f}%)")
 
     print("\nAuthor roles:")
-    for role, count in sorted(author_roles.items(), key=lambda x: x[1], reverse=True):
+    for role, count in author_roles.most_common():
         print(f"  - {role}: {count} messages ({count/message_count*100:.1f}%)")
 
     if sample_messages:
@@ -544,101 +611,117 @@ def analyze_model_details(all_conversations, model_id):
     print(f"\n{'='*80}")
 
 
-def find_conversations_by_date(analysis_results, target_date, original_data):
+def _row_total_tokens(conv):
+    """Total tokens for an analysis result, whichever mode produced it."""
+    if (
+        "total_input_tokens_across_turns" in conv
+        and "total_output_tokens_for_all_assistant_msgs" in conv
+    ):
+        return (
+            conv["total_input_tokens_across_turns"]
+            + conv["total_output_tokens_for_all_assistant_msgs"]
+        )
+
+    return conv.get("simple_total_input_tokens", 0) + conv.get(
+        "simple_total_output_tokens", 0
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _date_table_formats(terminal_width):
     """
-    Find conversations that occurred on a specific date.
+    Build the date browser's table layout for a terminal width.
 
     Args:
-        analysis_results: List of analysis results for each conversation
-        target_date: Date string in format YYYY-MM-DD
-        original_data: Original conversation data
+        terminal_width: Width of the terminal in columns
 
     Returns:
-        List of conversations that match the date
+        Tuple of (formatted header line, separator line, row format string)
     """
-    matching_conversations = []
-    target_dt = datetime.datetime.strptime(target_date, "%Y-%m-%d").date()
-
-    for conv in analysis_results:
-        # Get the original conversation data
-        conv_id = conv.get("conversation_id")
-        if not conv_id:
-            continue
-
-        # Find the original conversation
-        original_conv = None
-        for orig in original_data:
-            if orig.get("id") == conv_id:
-                original_conv = orig
-                break
-
-        if not original_conv:
-            continue
-
-        # Get create_time from original data
-        create_time = original_conv.get("create_time")
-        if not create_time:
-            continue
+    # Define table headers
+    headers = ["#", "Title", "Time", "Turns", "First Model", "Tokens", "Cost"]
+
+    # Calculate column widths (adjust as needed for your typical data)
+    id_width = 3
+    # Limit title width to make room for other columns
+    title_width = max(20, terminal_width - 80)
+    time_width = 10
+    turns_width = 6
+    model_width = 15
+    tokens_width = 10
+    cost_width = 8
+
+    header_format = (
+        f"{{:{id_width}}} | "
+        f"{{:{title_width}.{title_width}}} | "
+        f"{{:^{time_width}}} | "  # Center-align time
+        f"{{:^{turns_width}}} | "  # Center-align turns
+        f"{{:^{model_width}.{model_width}}} | "  # Center-align model
+        f"{{:>{tokens_width}}} | "  # Right-align tokens
+        f"{{:>{cost_width}}}"  # Right-align cost
+    )
 
-        # Get date part only for comparison
-        conv_date = datetime.datetime.fromtimestamp(create_time).date()
+    separator = (
+        "-" * id_width
+        + "+"
+        + "-" * (title_width + 2)
+        + "+"
+        + "-" * (time_width + 2)
+        + "+"
+        + "-" * (turns_width + 2)
+        + "+"
+        + "-" * (model_width + 2)
+        + "+"
+        + "-" * (tokens_width + 2)
+        + "+"
+        + "-" * cost_width
+    )
 
-        # Add to results if dates match
-        if conv_date == target_dt:
-            matching_conversations.append(conv)
+    row_format = (
+        f"{{:{id_width}}} | "
+        f"{{:{title_width}.{title_width}}} | "
+        f"{{:^{time_width}}} | "  # Center-align time
+        f"{{:^{turns_width}}} | "  # Center-align turns
+        f"{{:^{model_width}.{model_width}}} | "  # Center-align model
+        f"{{:>{tokens_width},}} | "  # Right-align tokens with comma separator
+        f"${{:>{cost_width-1}.4f}}"  # Right-align cost with dollar sign
+    )
 
-    return matching_conversations
+    return header_format.format(*headers), separator, row_format
 
 
-def get_conversation_dates(analysis_results, original_data):
+def _group_conversations_by_date(analysis_results, original_data):
     """
-    Get all unique dates that have conversations, sorted chronologically.
+    Group conversations by creation date in a single pass.
 
     Args:
         analysis_results: List of analysis results for each conversation
         original_data: Original conversation data
 
     Returns:
-        List of date strings in format YYYY-MM-DD
+        List of (date string in format YYYY-MM-DD, list of (analysis result,
+        original conversation) pairs) tuples, sorted chronologically
     """
-    date_dict = {}
+    orig_index = _index_originals(original_data)
 
+    by_date = defaultdict(list)
     for conv in analysis_results:
-        # Get the original conversation data
         conv_id = conv.get("conversation_id")
         if not conv_id:
             continue
 
-        # Find the original conversation
-        original_conv = None
-        for orig in original_data:
-            if orig.get("id") == conv_id:
-                original_conv = orig
-                break
-
+        original_conv = orig_index.get(conv_id)
         if not original_conv:
             continue
 
-        # Get create_time from original data
-        create_time = original_conv.get("create_time")
-        if not create_time:
+        conv_date = conv.get("create_date")
+        if not conv_date:
             continue
 
-        # Get date part as string
-        conv_date = datetime.datetime.fromtimestamp(create_time).date()
-        date_str = conv_date.strftime("%Y-%m-%d")
-
-        # Count conversations per date
-        if date_str in date_dict:
-            date_dict[date_str] += 1
-        else:
-            date_dict[date_str] = 1
-
-    # Convert to list of tuples (date_str, count) and sort by date
-    date_list = [(date, count) for date, count in date_dict.items()]
-    date_list.sort(key=lambda x: x[0])
+        by_date[conv_date].append((conv, original_conv))
 
-    return date_list
+    # YYYY-MM-DD strings sort chronologically
+    return sorted(by_date.items())
 
 
 def browse_conversations_by_date(analysis_results, original_data):
@@ -649,8 +732,8 @@ def browse_conversations_by_date(analysis_results, original_data):
         analysis_results: List of analysis results for each conversation
         original_data: Original conversation data
     """
-    # Get all dates with conversations
-    date_list = get_conversation_dates(analysis_results, original_data)
+    # Group conversations by date once, so navigating between dates needs no scans
+    date_list = _group_conversations_by_date(analysis_results, original_data)
 
     if not date_list:
         print("\nNo conversations with date information found.")
@@ -660,21 +743,20 @@ def browse_conversations_by_date(analysis_results, original_data):
     total_dates = len(date_list)
 
     while True:
+        # Collect the screen's lines and print them in one call
+        lines = []
+        out = lines.append
+
         # Display calendar header
-        print("\n=== Conversation Calendar ===")
-        print(f"Showing date {current_index + 1} of {total_dates}")
+        out("\n=== Conversation Calendar ===")
+        out(f"Showing date {current_index + 1} of {total_dates}")
 
-        # Get current date and count
-        current_date, conv_count = date_list[current_index]
+        # Get current date and its conversations
+        current_date, date_conversations = date_list[current_index]
 
         # Display date info
-        print(f"\nDate: {current_date}")
-        print(f"Conversations: {conv_count}")
-
-        # Find conversations for this date
-        date_conversations = find_conversations_by_date(
-            analysis_results, current_date, original_data
-        )
+        out(f"\nDate: {current_date}")
+        out(f"Conversations: {len(date_conversations)}")
 
         # Get wider terminal width information
         try:
@@ -685,64 +767,23 @@ def browse_conversations_by_date(analysis_results, original_data):
             terminal_width = 100
 
         # Display conversation list in a table format
-        print("\nConversations on this date:")
-
-        # Define table headers
-        headers = ["#", "Title", "Time", "Turns", "First Model", "Tokens", "Cost"]
-
-        # Calculate column widths (adjust as needed for your typical data)
-        id_width = 3
-        # Limit title width to make room for other columns
-        title_width = max(20, terminal_width - 80)
-        time_width = 10
-        turns_width = 6
-        model_width = 15
-        tokens_width = 10
-        cost_width = 8
-
-        # Print table header
-        header_format = (
-            f"{{:{id_width}}} | "
-            f"{{:{title_width}.{title_width}}} | "
-            f"{{:^{time_width}}} | "  # Center-align time
-            f"{{:^{turns_width}}} | "  # Center-align turns
-            f"{{:^{model_width}.{model_width}}} | "  # Center-align model
-            f"{{:>{tokens_width}}} | "  # Right-align tokens
-            f"{{:>{cost_width}}}"  # Right-align cost
-        )
-        print(header_format.format(*headers))
-
-        # Print separator line
-        separator = (
-            "-" * id_width
-            + "+"
-            + "-" * (title_width + 2)
-            + "+"
-            + "-" * (time_width + 2)
-            + "+"
-            + "-" * (turns_width + 2)
-            + "+"
-            + "-" * (model_width + 2)
-            + "+"
-            + "-" * (tokens_width + 2)
-            + "+"
-            + "-" * cost_width
-        )
-        print(separator)
+        out("\nConversations on this date:")
+
+        # Print table header and separator line
+        header_line, separator, row_format = _date_table_formats(terminal_width)
+        out(header_line)
+        out(separator)
 
         # Print each conversation
-        for i, conv in enumerate(date_conversations, 1):
+        for i, (conv, original_conv) in enumerate(date_conversations, 1):
             # Get basic info
             title = conv.get("title", "Untitled")
 
             # Get time (we already know the date)
-            create_time = ""
-            original_conv = find_original_conversation(conv, original_data)
-            if original_conv and original_conv.get("create_time"):
-                timestamp = datetime.datetime.fromtimestamp(
-                    original_conv.get("create_time")
-                )
-                create_time = timestamp.strftime("%H:%M:%S")
+            ts = original_conv.get("create_time") if original_conv else None
+            create_time = (
+                datetime.datetime.fromtimestamp(ts).strftime("%H:%M:%S") if ts else ""
+            )
 
             # Get turn count
             turn_count = conv.get("real_turns_count", "?")
@@ -753,37 +794,17 @@ def browse_conversations_by_date(analysis_results, original_data):
                 first_model = get_first_model_used(original_conv)
 
             # Get token info
-            total_tokens = 0
-            if (
-                "total_input_tokens_across_turns" in conv
-                and "total_output_tokens_for_all_assistant_msgs" in conv
-            ):
-                total_tokens = conv.get(
-                    "total_input_tokens_across_turns", 0
-                ) + conv.get("total_output_tokens_for_all_assistant_msgs", 0)
-            else:
-                total_tokens = conv.get("simple_total_input_tokens", 0) + conv.get(
-                    "simple_total_output_tokens", 0
-                )
+            total_tokens = _row_total_tokens(conv)
 
-            # Get cost estimate
-            cost = conv.get("total_cost", conv.get("simple_total_cost", 0))
+            # Get cost estimate, only looking up the simple-mode cost when needed
+            cost = conv.get("total_cost")
             if cost is None:
-                cost = 0.0
-
-            # Format values for display
-            row_format = (
-                f"{{:{id_width}}} | "
-                f"{{:{title_width}.{title_width}}} | "
-                f"{{:^{time_width}}} | "  # Center-align time
-                f"{{:^{turns_width}}} | "  # Center-align turns
-                f"{{:^{model_width}.{model_width}}} | "  # Center-align model
-                f"{{:>{tokens_width},}} | "  # Right-align tokens with comma separator
-                f"${{:>{cost_width-1}.4f}}"  # Right-align cost with dollar sign
-            )
+                cost = conv.get("simple_total_cost")
+                if cost is None:
+                    cost = 0.0
 
             try:
-                print(
+                out(
                     row_format.format(
                         i,
                         title,
@@ -796,19 +817,20 @@ def browse_conversations_by_date(analysis_results, original_data):
                 )
             except Exception as e:
                 # Fallback for formatting errors
-                print(
+                out(
                     f"{i}. {title} - {first_model} - {total_tokens:,} tokens - ${cost:.4f}"
                 )
 
         # Navigation options
-        print("\nNavigation options:")
+        out("\nNavigation options:")
         if current_index > 0:
-            print("P - Previous date")
+            out("P - Previous date")
         if current_index < total_dates - 1:
-            print("N - Next date")
-        print("J - Jump to specific date")
-        print("V - View conversation details")
-        print("R - Return to main menu")
+            out("N - Next date")
+        out("J - Jump to specific date")
+        out("V - View conversation details")
+        out("R - Return to main menu")
+        print("\n".join(lines))
 
         choice = input("\nEnter choice: ").upper()
 
@@ -861,13 +883,8 @@ def browse_conversations_by_date(analysis_results, original_data):
                 if view_choice.isdigit():
                     idx = int(view_choice) - 1
                     if 0 <= idx < len(date_conversations):
-                        original_conv = find_original_conversation(
-                            date_conversations[idx], original_data
-                        )
-                        if original_conv:
-                            display_conversation_text(original_conv)
-                        else:
-                            print("Error: Could not find original conversation data.")
+                        _, original_conv = date_conversations[idx]
+                        display_conversation_text(original_conv)
                     else:
                         print("Invalid conversation number.")
             except (ValueError, KeyboardInterrupt):
@@ -893,74 +910,120 @@ def get_first_model_used(conversation):
         return "unknown"
 
     # Get messages in chronological order
-    ordered_message_ids = get_message_chronological_order(mapping)
+    ordered_message_ids = get_cached_message_order(mapping)
     if not ordered_message_ids:
         return "unknown"
 
     # Check messages in order
     for msg_id in ordered_message_ids:
         msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
+        message = msg_data.get("message") if msg_data else None
+        if not message:
             continue
 
-        message = msg_data["message"]
-
         # Only interested in assistant messages that have a model
-        if message.get("author", {}).get("role") != "assistant":
+        author = message.get("author")
+        if not author or author.get("role") != "assistant":
             continue
 
         # Get model information
-        model = message.get("metadata", {}).get("model_slug", "")
+        metadata = message.get("metadata")
+        model = metadata.get("model_slug", "") if metadata else ""
         if model:
             return model
 
     return "unknown"
 
 
+def _analyze_one(conv, mode):
+    """
+    Analyzes one conversation and tags the result with its conversation ID.
+    Module-level so it can be pickled for worker processes.
+    """
+    analysis_result = analyze_conversation_tokens_and_costs(
+        conv, DEFAULT_MODEL_COSTS, mode
+    )
+    # Add conversation ID for later reference to original data
+    analysis_result["conversation_id"] = conv.get("id")
+    # Local creation date (YYYY-MM-DD), formatted once for the listings and date browser
+    create_time_ts = analysis_result.get("create_time_ts")
+    analysis_result["create_date"] = (
+        datetime.date.fromtimestamp(create_time_ts).isoformat()
+        if create_time_ts
+        else ""
+    )
+    return analysis_result
+
+
+def _iter_analysis_results(conversations, mode):
+    """
+    Yields analysis results in input order, using a process pool for large inputs.
+
+    Args:
+        conversations: List of conversation objects to analyze
+        mode: Calculation mode ("detailed" or "simple")
+
+    Returns:
+        Iterator of analysis result dicts
+    """
+    worker = functools.partial(_analyze_one, mode=mode)
+    workers = ANALYSIS_WORKERS or os.cpu_count() or 1
+
+    # Pickling conversations to workers only pays off once there is enough work
+    if workers <= 1 or len(conversations) < PARALLEL_ANALYSIS_THRESHOLD:
+        yield from map(worker, conversations)
+        return
+
+    chunksize = max(1, len(conversations) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(worker, conversations, chunksize=chunksize)
+
+
+def _build_parser():
+    """Builds the command-line parser used when main() is called without args."""
+    parser = argparse.ArgumentParser(
+        description="Analyze token usage in conversations."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["detailed", "simple"],
+        default=CALCULATION_MODE,
+        help="Analysis mode: 'detailed' or 'simple'",
+    )
+    parser.add_argument(
+        "--input",
+        required=True,
+        help="Path to input conversations file or directory",
+    )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default=DEFAULT_EXPORT_FORMAT,
+        help=f"Export format: {', '.join(EXPORT_FORMATS)}",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument(
+        "--filter-start-date",
+        help="Filter conversations from this date (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--filter-end-date",
+        help="Filter conversations until this date (YYYY-MM-DD)",
+    )
+    parser.add_argument("--filter-model", help="Filter conversations by model slug")
+    parser.add_argument("--view-id", help="View a specific conversation by ID")
+    parser.add_argument(
+        "--analyze-model",
+        help="Analyze details of a specific model (e.g., 'N/A', 'o3', etc.)",
+    )
+    return parser
+
+
 def main(args=None):
     """Main function to load, process, and analyze conversations."""
     if args is None:
-        # For backward compatibility or direct calls
-        import argparse
-
-        parser = argparse.ArgumentParser(
-            description="Analyze token usage in conversations."
-        )
-        parser.add_argument(
-            "--mode",
-            choices=["detailed", "simple"],
-            default=CALCULATION_MODE,
-            help="Analysis mode: 'detailed' or 'simple'",
-        )
-        parser.add_argument(
-            "--input",
-            required=True,
-            help="Path to input conversations file or directory",
-        )
-        parser.add_argument(
-            "--format",
-            choices=EXPORT_FORMATS,
-            default=DEFAULT_EXPORT_FORMAT,
-            help=f"Export format: {', '.join(EXPORT_FORMATS)}",
-        )
-        parser.add_argument(
-            "--verbose", action="store_true", help="Enable verbose output"
-        )
-        parser.add_argument(
-            "--filter-start-date",
-            help="Filter conversations from this date (YYYY-MM-DD)",
-        )
-        parser.add_argument(
-            "--filter-end-date",
-            help="Filter conversations until this date (YYYY-MM-DD)",
-        )
-        parser.add_argument("--filter-model", help="Filter conversations by model slug")
-        parser.add_argument("--view-id", help="View a specific conversation by ID")
-        parser.add_argument(
-            "--analyze-model",
-            help="Analyze details of a specific model (e.g., 'N/A', 'o3', etc.)",
-        )
-        args = parser.parse_args()
+        # Programmatic callers can pass any object with the same attributes instead
+        args = _build_parser().parse_args()
 
     # --- Process command-line arguments ---
     input_path = args.input
@@ -975,14 +1038,53 @@ def main(args=None):
 
     print("Starting conversation analysis...")
     print("Please ensure you have `tiktoken` installed (`pip install tiktoken`)\n")
-    print(
-        "For comprehensive reports, please install tabulate: `pip install tabulate`\n"
-    )
 
     # --- Load Data ---
+    # A model analysis reads each conversation only once, so its input is streamed
+    # instead of being held in memory as a whole. Streamed input is parsed lazily,
+    # which means decode errors can also surface while filtering or analyzing.
+    stream_input = bool(analyze_specific_model)
     print(f"Loading conversations from {input_path}...")
     try:
-        conversations_data = load_conversations(input_path)
+        if stream_input:
+            conversations_data = iter_conversations(input_path)
+        else:
+            conversations_data = load_conversations(input_path)
+            print(f"Loaded {len(conversations_data)} conversations.")
+
+        # --- Filter Conversations ---
+        # Both filters are applied together in one pass over the conversations
+        filtered_convs = conversations_data
+        if filter_start_date or filter_end_date or filter_model:
+            if filter_start_date or filter_end_date:
+                print(
+                    f"Filtering by date: Start='{filter_start_date}', End='{filter_end_date}'"
+                )
+            if filter_model:
+                print(f"Filtering by model: '{filter_model}'")
+            start_dt, end_dt = parse_date_bounds(filter_start_date, filter_end_date)
+            filtered_convs = list(
+                filter_conversations(filtered_convs, start_dt, end_dt, filter_model)
+            )
+            print(f"{len(filtered_convs)} conversations after filtering.")
+        elif stream_input:
+            # A stream is always truthy, so peek at its first conversation to tell
+            # whether there is anything to analyze
+            first_conv = next(filtered_convs, None)
+            filtered_convs = (
+                []
+                if first_conv is None
+                else itertools.chain((first_conv,), filtered_convs)
+            )
+
+        if not filtered_convs:
+            print("No conversations match the specified filters.")
+            return
+
+        # Check if we're doing a detailed model analysis
+        if analyze_specific_model:
+            analyze_model_details(filtered_convs, analyze_specific_model)
+            return
     except FileNotFoundError:
         print(f"Error: Input file {input_path} not found.")
         return
@@ -991,32 +1093,6 @@ def main(args=None):
             f"Error: Could not decode JSON from {input_path}. Ensure it's a valid JSON file."
         )
         return
-    print(f"Loaded {len(conversations_data)} conversations.")
-
-    # --- Filter Conversations ---
-    filtered_convs = conversations_data
-    if filter_start_date or filter_end_date:
-        print(
-            f"Filtering by date: Start='{filter_start_date}', End='{filter_end_date}'"
-        )
-        filtered_convs = filter_conversations_by_date(
-            filtered_convs, filter_start_date, filter_end_date
-        )
-        print(f"{len(filtered_convs)} conversations after date filtering.")
-
-    if filter_model:
-        print(f"Filtering by model: '{filter_model}'")
-        filtered_convs = filter_conversations_by_model(filtered_convs, filter_model)
-        print(f"{len(filtered_convs)} conversations after model filtering.")
-
-    if not filtered_convs:
-        print("No conversations match the specified filters.")
-        return
-
-    # Check if we're doing a detailed model analysis
-    if analyze_specific_model:
-        analyze_model_details(filtered_convs, analyze_specific_model)
-        return
 
     # --- Analyze Conversations ---
     all_analysis_results = []
@@ -1024,12 +1100,9 @@ def main(args=None):
         f"\nAnalyzing {len(filtered_convs)} conversations using '{current_calculation_mode}' mode..."
     )
 
-    for i, conv in enumerate(filtered_convs):
-        analysis_result = analyze_conversation_tokens_and_costs(
-            conv, DEFAULT_MODEL_COSTS, current_calculation_mode
-        )
-        # Add conversation ID for later reference to original data
-        analysis_result["conversation_id"] = conv.get("id")
+    for i, analysis_result in enumerate(
+        _iter_analysis_results(filtered_convs, current_calculation_mode)
+    ):
         all_analysis_results.append(analysis_result)
 
         # Show progress for large datasets
@@ -1088,11 +1161,7 @@ def main(args=None):
                     # Show list of matching conversations
                     for i, conv in enumerate(matching_conversations, 1):
                         title = conv.get("title", "Untitled")
-                        create_time = ""
-                        if conv.get("create_time_ts"):
-                            create_time = datetime.datetime.fromtimestamp(
-                                conv.get("create_time_ts")
-                            ).strftime("%Y-%m-%d")
+                        create_time = conv.get("create_date", "")
 
                         print(f"{i}. {title} ({create_time})")
 
@@ -1129,11 +1198,7 @@ def main(args=None):
                     # Show list of matching conversations
                     for i, conv in enumerate(matching_conversations, 1):
                         title = conv.get("title", "Untitled")
-                        create_time = ""
-                        if conv.get("create_time_ts"):
-                            create_time = datetime.datetime.fromtimestamp(
-                                conv.get("create_time_ts")
-                            ).strftime("%Y-%m-%d")
+                        create_time = conv.get("create_date", "")
 
                         print(f"{i}. {title} ({create_time})")
 
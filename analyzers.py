@@ -1,7 +1,7 @@
 """Functions for analyzing conversations for token counts and costs."""
 
 from message_ordering import get_message_chronological_order
-from tokenizers import extract_text_from_message
+from tokenizers import count_message_tokens
 from config import DEFAULT_MODEL_COSTS
 
 
@@ -15,7 +15,7 @@ def identify_model_from_metadata(message):
     Returns:
         A string identifying the model or a descriptive fallback
     """
-    metadata = message.get("metadata", {})
+    metadata = message.get("metadata") or {}
 
     # First try direct model_slug
     model_slug = metadata.get("model_slug")
@@ -40,37 +40,31 @@ def identify_model_from_metadata(message):
     return "N/A"
 
 
-def count_real_turns(mapping, ordered_message_ids):
+def resolve_model_costs(costs_config, model_slug):
     """
-    Count the actual number of turns in a conversation by using the end_turn field.
-    A turn ends when a message with end_turn=true is encountered.
+    Resolves the cost rates that apply to a model slug.
 
     Args:
-        mapping: The conversation message mapping
-        ordered_message_ids: The message IDs in chronological order
+        costs_config: Dictionary of model slug to cost rates
+        model_slug: The message's model slug (may be None)
 
     Returns:
-        The number of real turns in the conversation
+        The slug's own rates, falling back to "o3", then the first configured model,
+        and finally the built-in "o3" rates
     """
-    turn_count = 0
-    for msg_id in ordered_message_ids:
-        msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
-            continue
-
-        message = msg_data["message"]
-
-        # Check if this message ends a turn
-        if message.get("end_turn") is True:
-            turn_count += 1
-
-    return turn_count
+    return (
+        costs_config.get(model_slug)
+        or costs_config.get("o3")
+        or next(iter(costs_config.values()), None)
+        or DEFAULT_MODEL_COSTS["o3"]
+    )
 
 
 def analyze_conversation_tokens_and_costs(conversation, costs_config, mode="detailed"):
     """
     Analyzes a single conversation for token counts and API costs.
     Mode can be "detailed" or "simple".
+    Results without an "error" key always include "real_turns_count".
     """
     title = conversation.get("title", "N/A")
     conv_create_time = conversation.get("create_time")
@@ -96,33 +90,38 @@ def analyze_conversation_tokens_and_costs(conversation, costs_config, mode="deta
             "mode": mode,
         }
 
-    # Count real turns using end_turn field
-    real_turns_count = count_real_turns(mapping, ordered_message_ids)
-
     if mode == "simple":
+        real_turns_count = 0  # Counted from the end_turn field in the same pass
         simple_user_tokens = 0
         simple_assistant_tokens = 0
         simple_system_tokens = 0
 
         for msg_id in ordered_message_ids:
             msg_data = mapping.get(msg_id)
-            if not msg_data or not msg_data.get("message"):
+            message = msg_data.get("message") if msg_data else None
+            if not message:
                 continue
 
-            message = msg_data["message"]
-            author_role = message.get("author", {}).get("role", "unknown")
+            author = message.get("author")
+            author_role = author.get("role", "unknown") if author else "unknown"
+
+            if message.get("end_turn") is True:
+                real_turns_count += 1
+
+            # Only user, assistant and system messages are counted
+            if author_role not in ("user", "assistant", "system"):
+                continue
+            tokens_with_thoughts, tokens_without_thoughts = count_message_tokens(
+                msg_data
+            )
 
             if author_role == "user":
-                _, tokens = extract_text_from_message(msg_data, count_thoughts=False)
-                simple_user_tokens += tokens
+                simple_user_tokens += tokens_without_thoughts
             elif author_role == "assistant":
-                _, tokens = extract_text_from_message(
-                    msg_data, count_thoughts=True
-                )  # Count thoughts for assistant output
-                simple_assistant_tokens += tokens
-            elif author_role == "system":
-                _, tokens = extract_text_from_message(msg_data, count_thoughts=False)
-                simple_system_tokens += tokens
+                # Count thoughts for assistant output
+                simple_assistant_tokens += tokens_with_thoughts
+            else:
+                simple_system_tokens += tokens_without_thoughts
 
         simple_total_input_tokens_val = simple_user_tokens + simple_system_tokens
         simple_total_output_tokens_val = simple_assistant_tokens
@@ -193,63 +192,55 @@ def analyze_conversation_tokens_and_costs(conversation, costs_config, mode="deta
 
     processed_turns = []
     assistant_message_count_in_convo = 0
-    current_turn_messages = []  # To collect messages in the current turn
-    turn_boundaries = []  # To track where turn boundaries occur
-
-    # Find turn boundaries (indexes where end_turn is True)
-    for i, msg_id in enumerate(ordered_message_ids):
-        msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
-            continue
-
-        message = msg_data["message"]
-        if message.get("end_turn") is True:
-            turn_boundaries.append(i)
-
-    # This list will store (message_id, role, message_text_for_tokens, token_count) for all messages up to a point
-    history_for_inputs = []
+    last_assistant_index = -1  # Messages after this one feed no input or output
+
+    # Find the last assistant message by scanning back from the end, which usually
+    # stops within the last message or two
+    for i in range(len(ordered_message_ids) - 1, -1, -1):
+        msg_data = mapping.get(ordered_message_ids[i])
+        message = msg_data.get("message") if msg_data else None
+        author = message.get("author") if message else None
+        if author and author.get("role") == "assistant":
+            last_assistant_index = i
+            break
+
+    # Rates resolved once per model slug seen in this conversation
+    rates_by_slug = {}
+
+    # Running total of history tokens (thoughts excluded) for all messages so far
+    history_token_sum = 0
     current_turn_index = 0  # To track which turn we're processing
 
     for i, msg_id in enumerate(ordered_message_ids):
         msg_data = mapping.get(msg_id)
-        if not msg_data or not msg_data.get("message"):
+        message = msg_data.get("message") if msg_data else None
+        if not message:
             # print(f"Skipping node {msg_id} as it's not a message or is missing.")
             continue
 
-        message = msg_data["message"]
-        author_role = message.get("author", {}).get("role", "unknown")
-        model_slug = message.get("metadata", {}).get(
-            "model_slug"
+        author = message.get("author")
+        author_role = author.get("role", "unknown") if author else "unknown"
+        metadata = message.get("metadata")
+        model_slug = (
+            metadata.get("model_slug") if metadata else None
         )  # Typically on assistant messages
 
         # Determine costs for the current message's model, defaulting if not found
-        current_model_costs = costs_config.get(
-            model_slug, costs_config.get("o3")
-        )  # Fallback to o3 if specific slug not in costs
-        if not current_model_costs:  # Further fallback if "o3" itself is missing
-            current_model_costs = (
-                list(costs_config.values())[0]
-                if costs_config
-                else DEFAULT_MODEL_COSTS["o3"]
-            )  # Absolute fallback
-
-        # Extract text and count tokens for the current message
-        # Tokenizer is now determined within extract_text_from_message based on msg_data
-        _, current_message_output_tokens = extract_text_from_message(
-            msg_data, count_thoughts=True
-        )
-        _, current_message_tokens_for_history = extract_text_from_message(
-            msg_data, count_thoughts=False
-        )
+        current_model_costs = rates_by_slug.get(model_slug)
+        if current_model_costs is None:
+            current_model_costs = rates_by_slug[model_slug] = resolve_model_costs(
+                costs_config, model_slug
+            )
 
-        current_message_info_for_history = (
-            msg_id,
-            author_role,
-            current_message_tokens_for_history,
+        # Token counts for the current message, with and without thoughts (the
+        # tokenizer is chosen per message based on its model_slug). Messages after
+        # the last assistant message are never billed, so they are not counted.
+        current_message_output_tokens, current_message_tokens_for_history = (
+            count_message_tokens(msg_data) if i <= last_assistant_index else (0, 0)
         )
 
         # Add to history
-        history_for_inputs.append(current_message_info_for_history)
+        history_token_sum += current_message_tokens_for_history
 
         if author_role == "assistant":
             assistant_message_count_in_convo += 1
@@ -265,12 +256,10 @@ def analyze_conversation_tokens_and_costs(conversation, costs_config, mode="deta
                 "output_cost_per_million_tokens"
             ]
 
-            # Input tokens are from all *prior* messages in history_for_inputs (where thoughts were excluded)
+            # Input tokens are from all *prior* messages in the history (where thoughts were excluded)
             # We exclude the current message from input tokens calculation
-            input_tokens_for_this_msg = sum(
-                tok_count
-                for j, (_, _, tok_count) in enumerate(history_for_inputs)
-                if j < len(history_for_inputs) - 1
+            input_tokens_for_this_msg = (
+                history_token_sum - current_message_tokens_for_history
             )
 
             input_cost_rate = current_model_costs["input_cost_per_million_tokens"]
@@ -309,6 +298,9 @@ def analyze_conversation_tokens_and_costs(conversation, costs_config, mode="deta
         if is_turn_end:
             current_turn_index += 1
 
+    # Every end_turn message advanced the turn index, so it is the real turn count
+    real_turns_count = current_turn_index
+
     return {
         "title": title,
         "create_time_ts": conv_create_time,
@@ -44,3 +44,7 @@ EXPORT_FORMATS = ["csv", "json", "text"]  # Supported export formats
 DEFAULT_EXPORT_FORMAT = "text"  # Default export format
 REPORT_DIRECTORY = "reports"  # Directory to save reports
 VERBOSE_MODE = False  # Default to concise reporting
+
+# --- Configuration options for analysis ---
+ANALYSIS_WORKERS = None  # Worker processes for analysis (None = CPU count, 1 = off)
+PARALLEL_ANALYSIS_THRESHOLD = 200  # Below this many conversations, analyze inline
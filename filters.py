@@ -3,50 +3,57 @@
 import datetime
 
 
-def filter_conversations_by_date(conversations, start_date_str=None, end_date_str=None):
-    """Filters conversations based on their top-level create_time."""
-    if not start_date_str and not end_date_str:
-        return conversations
+def _parse_date(date_str):
+    """
+    Parses a YYYY-MM-DD string with the C ISO parser, falling back to strptime
+    for forms only it accepts (e.g. unpadded "2024-1-5").
+    """
+    try:
+        return datetime.date.fromisoformat(date_str)
+    except ValueError:
+        return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def parse_date_bounds(start_date_str=None, end_date_str=None):
+    """
+    Parses YYYY-MM-DD filter strings into inclusive datetime bounds.
 
-    filtered = []
+    Args:
+        start_date_str: Start date string, or None for no lower bound
+        end_date_str: End date string, or None for no upper bound
+
+    Returns:
+        Tuple (start_dt, end_dt); start is the beginning of its day, end the last
+        microsecond of its day, and either may be None
+    """
     start_dt = None
     end_dt = None
 
     if start_date_str:
-        start_dt = datetime.datetime.strptime(start_date_str, "%Y-%m-%d").replace(
-            hour=0, minute=0, second=0, microsecond=0
+        start_dt = datetime.datetime.combine(
+            _parse_date(start_date_str), datetime.time.min
         )
     if end_date_str:
-        end_dt = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").replace(
-            hour=23, minute=59, second=59, microsecond=999999
-        )
+        end_dt = datetime.datetime.combine(_parse_date(end_date_str), datetime.time.max)
 
-    for conv in conversations:
-        conv_time_ts = conv.get("create_time")  # or use 'update_time' if preferred
-        if not conv_time_ts:
-            # if create_time is missing, maybe include it or log a warning
-            # For now, we'll include it if no date filter is strictly violated
-            if (
-                start_dt or end_dt
-            ):  # if any date filter is active, and this one is unknown, exclude.
-                # Or decide to include if it's an important conversation. For now, exclude if timestamp is missing and filtering is active.
-                continue
-            else:  # No date filters active, so include it
-                filtered.append(conv)
-                continue
+    return start_dt, end_dt
 
-        conv_dt = datetime.datetime.fromtimestamp(conv_time_ts)
 
-        passes_filter = True
-        if start_dt and conv_dt < start_dt:
-            passes_filter = False
-        if end_dt and conv_dt > end_dt:
-            passes_filter = False
+def _bounds_to_timestamps(start_dt, end_dt):
+    """Converts local datetime bounds to POSIX timestamps, keeping None for open bounds."""
+    return (
+        start_dt.timestamp() if start_dt else None,
+        end_dt.timestamp() if end_dt else None,
+    )
 
-        if passes_filter:
-            filtered.append(conv)
 
-    return filtered
+def filter_conversations_by_date(conversations, start_date_str=None, end_date_str=None):
+    """Filters conversations based on their top-level create_time."""
+    if not start_date_str and not end_date_str:
+        return conversations
+
+    start_dt, end_dt = parse_date_bounds(start_date_str, end_date_str)
+    return list(filter_conversations(conversations, start_dt, end_dt))
 
 
 def filter_conversations_by_model(conversations, model_slug_filter=None):
@@ -57,19 +64,59 @@ def filter_conversations_by_model(conversations, model_slug_filter=None):
     if not model_slug_filter:
         return conversations
 
-    filtered_conversations = []
+    return list(
+        filter_conversations(conversations, model_slug_filter=model_slug_filter)
+    )
+
+
+def _assistant_used_model(conversation, model_slug_filter):
+    """Checks whether any assistant message in the conversation used the model_slug."""
+    for msg_data in conversation.get("mapping", {}).values():
+        message = msg_data.get("message")
+        if not message:
+            continue
+
+        # The slug comparison rejects most messages (user, system, other models),
+        # so it runs before the role check
+        metadata = message.get("metadata")
+        if not metadata or metadata.get("model_slug") != model_slug_filter:
+            continue
+        author = message.get("author")
+        if author and author.get("role") == "assistant":
+            return True
+    return False
+
+
+def filter_conversations(
+    conversations, start_dt=None, end_dt=None, model_slug_filter=None
+):
+    """
+    Applies the date and model filters in a single pass over the conversations.
+
+    Args:
+        conversations: Iterable of conversation objects
+        start_dt: Inclusive lower datetime bound (see parse_date_bounds), or None
+        end_dt: Inclusive upper datetime bound, or None
+        model_slug_filter: Model slug an assistant message must have used, or None
+
+    Returns:
+        Generator of the conversations that pass every active filter
+    """
+    date_filter_active = start_dt is not None or end_dt is not None
+    start_ts, end_ts = _bounds_to_timestamps(start_dt, end_dt)
+
     for conv in conversations:
-        mapping = conv.get("mapping", {})
-        assistant_used_model = False
-        for msg_id, msg_data in mapping.items():
-            message = msg_data.get("message")
-            if message:
-                author_role = message.get("author", {}).get("role")
-                if author_role == "assistant":
-                    metadata = message.get("metadata", {})
-                    if metadata.get("model_slug") == model_slug_filter:
-                        assistant_used_model = True
-                        break
-        if assistant_used_model:
-            filtered_conversations.append(conv)
-    return filtered_conversations
+        # Check the cheap timestamp bounds before walking the message mapping
+        if date_filter_active:
+            conv_time_ts = conv.get("create_time")
+            if not conv_time_ts:
+                continue  # Unknown dates are excluded while a date filter is active
+            if start_ts is not None and conv_time_ts < start_ts:
+                continue
+            if end_ts is not None and conv_time_ts > end_ts:
+                continue
+
+        if model_slug_filter and not _assistant_used_model(conv, model_slug_filter):
+            continue
+
+        yield conv
@@ -1,10 +1,76 @@
 """Functions for loading conversation data."""
 
 import json
+import mmap
+from message_ordering import clear_order_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it streaming loads the whole file
+    ijson = None
 
 
 def load_conversations(file_path):
     """Loads conversations from a JSON file."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        # orjson parses straight from bytes; its decode errors subclass
+        # json.JSONDecodeError, so callers handle both parsers the same way
+        with open(file_path, "rb") as f:
+            data = _orjson_load_mapped(f)
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    # Orders cached for a previously loaded dataset no longer apply
+    clear_order_cache()
     return data
+
+
+def _orjson_load_mapped(f):
+    """
+    Parses the file with orjson through a read-only memory map, so the kernel pages
+    the file in on demand instead of it first being copied into a bytes object.
+    Falls back to a plain read for files that cannot be mapped (e.g. empty files).
+    """
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return orjson.loads(f.read())
+
+    with mapped:
+        # The file is parsed front to back, so ask for aggressive readahead
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        # orjson accepts a memoryview but not the mmap object itself; the view must
+        # be released before the map is closed
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
+
+
+def iter_conversations(file_path):
+    """
+    Returns an iterator over the conversations in a JSON file.
+    With ijson installed the file is parsed incrementally, so only the current
+    conversation is held in memory; otherwise the whole file is loaded up front.
+    A missing file raises immediately, while malformed JSON raises
+    json.JSONDecodeError during iteration.
+    """
+    if ijson is None:
+        return iter(load_conversations(file_path))
+
+    f = open(file_path, "rb")
+    clear_order_cache()
+    return _iter_json_array_items(f)
+
+
+def _iter_json_array_items(f):
+    """Yields the items of the top-level JSON array in f, closing f when done."""
+    with f:
+        try:
+            yield from ijson.items(f, "item", use_float=True)
+        except ijson.JSONError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
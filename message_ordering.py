@@ -1,5 +1,20 @@
 """Functions for determining message order in conversations."""
 
+# Cached message orders keyed by id(mapping). The mapping itself is stored with
+# its order so a recycled id can never return a stale result.
+_ORDER_CACHE = {}
+
+
+def _is_guid(msg_id):
+    """Checks for the 8-4-4-4-12 GUID layout by testing the fixed dash positions."""
+    return (
+        len(msg_id) == 36
+        and msg_id[8] == "-"
+        and msg_id[13] == "-"
+        and msg_id[18] == "-"
+        and msg_id[23] == "-"
+    )
+
 
 def get_message_chronological_order(conversation_mapping):
     """
@@ -9,112 +24,168 @@ def get_message_chronological_order(conversation_mapping):
     if not conversation_mapping:
         return []
 
-    # Find the root message (no parent or parent is 'client-created-root')
-    root_id = None
-    # Try to find 'client-created-root' first
+    # Find the root message (no parent or parent is 'client-created-root').
+    # ChatGPT exports almost always have 'client-created-root', so that case takes
+    # its own straight-line path.
     if "client-created-root" in conversation_mapping:
-        root_id = "client-created-root"
-    else:  # Fallback: find a message with no parent or a non-existent parent
-        all_ids = set(conversation_mapping.keys())
-        child_ids_with_valid_parents = set()
-        for msg_id, msg_data in conversation_mapping.items():
-            parent_id = msg_data.get("parent")
-            if parent_id and parent_id in all_ids:
-                child_ids_with_valid_parents.add(msg_id)
-
-        possible_roots = list(all_ids - child_ids_with_valid_parents)
+        return _order_from_client_root(conversation_mapping)
+    return _order_from_discovered_root(conversation_mapping)
+
+
+def _order_from_client_root(conversation_mapping):
+    """Orders messages starting below the 'client-created-root' container node."""
+    # The root's message is null, so we start with its child. If client-created-root
+    # has multiple children this might be tricky, but typically the first one
+    # points to the start of the actual message chain.
+    root_node = conversation_mapping["client-created-root"]
+    children_of_root = root_node.get("children") if root_node else None
+    if not children_of_root:
+        return []  # No messages after the dummy root
+
+    first_id = children_of_root[0]
+    first_node = conversation_mapping.get(first_id)
+
+    # If the first child has a message, add it
+    if first_node and first_node.get("message"):
+        ordered_message_ids = [first_id]
+        visited_ids = {first_id}
+    else:
+        ordered_message_ids = []
+        visited_ids = set()
+
+    return _follow_main_thread(
+        conversation_mapping,
+        first_node if first_id else None,
+        ordered_message_ids,
+        visited_ids,
+    )
+
+
+def _order_from_discovered_root(conversation_mapping):
+    """Orders messages from a root found among the nodes without a valid parent."""
+    if len(conversation_mapping) == 1:
+        # A lone node is the root unless its parent link points at itself,
+        # so no sets are needed to find it
+        ((root_id, root_node),) = conversation_mapping.items()
+        if (parent_id := root_node.get("parent")) and parent_id == root_id:
+            return []
+    else:
+        # Fallback: find a message with no parent or a non-existent parent.
+        # One pass collects every node whose parent exists in the mapping
+        child_ids_with_valid_parents = {
+            msg_id
+            for msg_id, msg_data in conversation_mapping.items()
+            if (parent_id := msg_data.get("parent"))
+            and parent_id in conversation_mapping
+        }
+
+        possible_roots = list(
+            set(conversation_mapping.keys()) - child_ids_with_valid_parents
+        )
         if not possible_roots:
             return []  # Should not happen in valid data
-        # Prefer a root that is not a typical message guid if multiple roots found without client-created-root
-        non_guid_roots = [
-            r for r in possible_roots if not (len(r) == 36 and r.count("-") == 4)
-        ]
-        if non_guid_roots:
-            root_id = non_guid_roots[0]
-        elif possible_roots:
-            root_id = possible_roots[0]  # Pick one if all are GUID like
-        else:
-            return []
+        # Prefer a root that is not a typical message guid if multiple roots found without client-created-root,
+        # otherwise pick one if all are GUID like
+        root_id = next(
+            (r for r in possible_roots if not _is_guid(r)), possible_roots[0]
+        )
+        root_node = conversation_mapping.get(root_id)
+
+    # The root_id itself is the first message node: add it if it's a message and
+    # not just a placeholder, then process its children
+    ordered_message_ids = [root_id] if root_node and root_node.get("message") else []
+
+    return _follow_main_thread(
+        conversation_mapping,
+        root_node if root_id else None,
+        ordered_message_ids,
+        set(),
+    )
+
+
+def _follow_main_thread(
+    conversation_mapping, start_node, ordered_message_ids, visited_ids
+):
+    """
+    Follows the first child from start_node to reconstruct the main conversation
+    thread, appending message IDs to ordered_message_ids.
 
-    ordered_message_ids = []
-
-    current_id = root_id
-    visited_for_children_expansion = set()
-
-    # Traverse using a queue for breadth-first like expansion based on children
-    # More robustly, a depth-first traversal from the root following the primary child link
-    # The structure is a tree, so direct DFS from the root is usually how it's structured.
-
-    # Let's use the create_time on messages if available, as a primary sort key within the mapping,
-    # then fall back to tree traversal if times are missing or inconsistent.
-    # The sample data shows some messages (system) have null create_time.
-    # Tree traversal seems more robust.
-
-    # Start with the root's first child if root is 'client-created-root' and it's just a container
-    if root_id == "client-created-root" and conversation_mapping.get(root_id, {}).get(
-        "children"
-    ):
-        # If client-created-root has multiple children, this might be tricky,
-        # but typically it points to the start of the actual message chain.
-        current_id = conversation_mapping[root_id]["children"][0]
-
-    # Iterative DFS based on the 'children' array (assuming first child is the main path)
-    # This assumes a linear conversation flow for the main turn-by-turn.
-    # Parallel branches (multiple children) could represent alternative generation paths.
-    # For this analysis, we typically follow the main accepted path.
-
-    # We must process the actual root if it's a message, then its child.
-    # If root_id is 'client-created-root', its message is null, so we start with its child.
-    # Otherwise, the found root_id is the first message.
-
-    # Let's refine the starting point
-    if root_id == "client-created-root":
-        children_of_root = conversation_mapping.get(root_id, {}).get("children", [])
-        if not children_of_root:
-            return []  # No messages after the dummy root
-        # Assuming the first child of client-created-root is the actual first message node
-        # This might need adjustment if there can be multiple starting branches from client-created-root
-        current_id = children_of_root[0]
-    else:  # The root_id itself is the first message node
-        # Add the root itself if it's a message and not just a placeholder
-        if conversation_mapping.get(current_id, {}).get("message"):
-            ordered_message_ids.append(current_id)
-        # And then prepare to process its children
-
-    # Iteratively follow the first child to reconstruct the main conversation thread
-    # This assumes that the conversation is primarily linear, and 'children[0]' represents the next message in sequence.
-
-    visited_ids = (
-        set()
-    )  # To handle potential cycles or reprocessing, though not expected in clean data
-
-    # If the current_id (derived root or its first child) has a message, add it.
-    if current_id not in ordered_message_ids and conversation_mapping.get(
-        current_id, {}
-    ).get("message"):
-        ordered_message_ids.append(current_id)
-        visited_ids.add(current_id)
-
-    while current_id:
-        msg_node = conversation_mapping.get(current_id)
+    This assumes the conversation is primarily linear and 'children[0]' is the next
+    message in sequence; parallel branches (multiple children) represent alternative
+    generation paths, and we follow the main accepted path. visited_ids holds ids
+    that end the walk if the chain reaches them again.
+    """
+    # Each child node is fetched once and reused as the next step's node
+    mapping_get = conversation_mapping.get
+    walk_start = len(ordered_message_ids)
+
+    # Instead of hashing every id into visited_ids, bound the walk by the node count.
+    # A chain without repeats ends within that many steps, so only a cycle can use
+    # up the budget.
+    msg_node = start_node
+    for _ in range(len(conversation_mapping) + 2):
         if not msg_node:
-            break  # Should not happen
+            break  # A missing node should not happen
+        children = msg_node.get("children")
+        if not children:
+            break  # End of this branch
+
+        # We assume the first child is the continuation of the main conversation
+        next_id = children[0]
+        next_node = mapping_get(next_id)
+        if next_node and next_node.get("message"):  # Only add if it's a message node
+            ordered_message_ids.append(next_id)
+
+        msg_node = next_node if next_id else None
+    else:
+        # Cycle detected: redo the walk tracking visited ids so it stops where the cycle closes
+        del ordered_message_ids[walk_start:]
+        _append_chain_until_repeat(
+            conversation_mapping, start_node, visited_ids, ordered_message_ids
+        )
 
-        children = msg_node.get("children", [])
-        if children:
-            # We assume the first child is the continuation of the main conversation
-            next_id = children[0]
-            if next_id in visited_ids:
-                break  # Cycle detected or already processed this path
+    return ordered_message_ids
 
-            if conversation_mapping.get(next_id, {}).get(
-                "message"
-            ):  # Only add if it's a message node
-                ordered_message_ids.append(next_id)
 
-            visited_ids.add(next_id)
-            current_id = next_id
-        else:
-            current_id = None  # End of this branch
+def _append_chain_until_repeat(
+    conversation_mapping, msg_node, visited_ids, ordered_message_ids
+):
+    """
+    Follows the first-child chain from msg_node, appending message ids until an id
+    that is already in visited_ids comes up again. Used when the chain has a cycle.
+    """
+    while msg_node:
+        children = msg_node.get("children")
+        if not children:
+            break
 
+        next_id = children[0]
+        if next_id in visited_ids:
+            break  # Cycle detected or already processed this path
+
+        next_node = conversation_mapping.get(next_id)
+        if next_node and next_node.get("message"):
+            ordered_message_ids.append(next_id)
+
+        visited_ids.add(next_id)
+        msg_node = next_node if next_id else None
+
+
+def get_cached_message_order(conversation_mapping):
+    """
+    Returns the chronological message order for a mapping, computing it only once.
+    The result is a tuple of message IDs shared between callers.
+    """
+    key = id(conversation_mapping)
+    cached = _ORDER_CACHE.get(key)
+    if cached is not None and cached[0] is conversation_mapping:
+        return cached[1]
+
+    ordered_message_ids = tuple(get_message_chronological_order(conversation_mapping))
+    _ORDER_CACHE[key] = (conversation_mapping, ordered_message_ids)
     return ordered_message_ids
+
+
+def clear_order_cache():
+    """Drops all cached message orders, e.g. when a new dataset is loaded."""
+    _ORDER_CACHE.clear()
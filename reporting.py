@@ -1,11 +1,18 @@
 """Functions for generating and exporting reports."""
 
 import os
+import sys
 import json
 import csv
 import datetime
-from collections import defaultdict
-from tabulate import tabulate
+import heapq
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
 from config import (
     REPORT_DIRECTORY,
     DEFAULT_EXPORT_FORMAT,
@@ -13,6 +20,280 @@ from config import (
     DEFAULT_MODEL_COSTS,
 )
 
+# Fields read from each valid analysis result. analyze_conversation_tokens_and_costs
+# always sets these on results without an "error" key, so they are fetched
+# together instead of through per-key .get() fallbacks.
+_detailed_result_fields = itemgetter(
+    "total_input_tokens_across_turns",
+    "total_output_tokens_for_all_assistant_msgs",
+    "total_cost",
+    "real_turns_count",
+    "assistant_messages_count",
+    "turns_details",
+)
+# Every entry of a detailed result's turns_details has these fields as well
+_turn_fields = itemgetter(
+    "model_slug", "input_tokens", "output_tokens", "turn_total_cost"
+)
+_simple_result_fields = itemgetter(
+    "simple_total_user_tokens",
+    "simple_total_assistant_tokens",
+    "simple_total_system_tokens",
+    "simple_total_input_tokens",
+    "simple_total_output_tokens",
+    "simple_input_cost",
+    "simple_output_cost",
+    "simple_total_cost",
+    "real_turns_count",
+    "simple_cost_model_key",
+)
+
+# Row templates for the report tables. Each row is formatted with a single
+# %-operation and split into cells on the ASCII unit separator, which does not
+# occur in model names or dates.
+_CELL_SEPARATOR = "\x1f"
+_MODEL_ROW_FORMAT = _CELL_SEPARATOR.join(["%s", "%d", "%s", "$%.2f", "%.2f%%", "$%.2f"])
+_VERBOSE_MODEL_ROW_FORMAT = _CELL_SEPARATOR.join(
+    ["%s", "%d", "%s", "%s", "%s", "$%.2f", "$%.2f", "$%.2f", "%.2f%%", "%.2f", "$%.2f"]
+)
+_DAY_ROW_FORMAT = _CELL_SEPARATOR.join(
+    ["%s", "%d", "%d", "%s", "$%.2f", "%.2f", "$%.2f"]
+)
+_VERBOSE_DAY_ROW_FORMAT = _CELL_SEPARATOR.join(
+    ["%s", "%d", "%d", "%d", "%s", "%s", "%s", "$%.2f", "%.2f", "%.2f", "$%.2f"]
+)
+
+# Write buffer for CSV exports, so rows are flushed in large chunks
+_CSV_BUFFER_SIZE = 1 << 20
+
+# (input, output) cost rates per million tokens for each configured model
+_MODEL_COST_RATES = {
+    model_name: (
+        cost_info.get("input_cost_per_million_tokens", 0.0),
+        cost_info.get("output_cost_per_million_tokens", 0.0),
+    )
+    for model_name, cost_info in DEFAULT_MODEL_COSTS.items()
+}
+
+
+def _new_model_stats(input_cost_rate=0.0, output_cost_rate=0.0):
+    """Returns an empty model breakdown entry with the model's cost rates."""
+    return {
+        "message_count": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_cost": 0,
+        "input_cost_rate": input_cost_rate,
+        "output_cost_rate": output_cost_rate,
+    }
+
+
+def _new_day_stats():
+    """Returns an empty daily stats entry."""
+    return {
+        "conversation_count": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_cost": 0,
+        "total_turns": 0,
+        "total_assistant_messages": 0,
+    }
+
+
+def _parse_numeric_cell(cell):
+    """
+    Returns (value, is_integer) for a numeric table cell, allowing thousands
+    separators in strings, or None if the cell is not a number.
+    """
+    if isinstance(cell, int):
+        return cell, True
+    if isinstance(cell, float):
+        return cell, False
+    try:
+        value = float(cell.replace(",", ""))
+    except ValueError:
+        return None
+    return value, "." not in cell and "e" not in cell.lower()
+
+
+def _format_grid_column(column):
+    """
+    Formats one table column the way tabulate does: all-integer columns are shown
+    as given, other numeric columns are reformatted with "g" and aligned on the
+    decimal point, and text columns are left as they are.
+
+    Returns:
+        Tuple (cells, is_numeric) with the formatted cell strings
+    """
+    parsed = [_parse_numeric_cell(cell) for cell in column]
+    if not column or None in parsed:
+        return [str(cell) for cell in column], False
+    if all(is_integer for _, is_integer in parsed):
+        return [str(cell) for cell in column], True
+
+    cells = [format(value, "g") for value, _ in parsed]
+    # Digits after the decimal point (or exponent marker), -1 when there is none
+    after_point = []
+    for cell in cells:
+        point = cell.rfind(".")
+        if point < 0:
+            point = cell.lower().rfind("e")
+        after_point.append(len(cell) - point - 1 if point >= 0 else -1)
+    max_after_point = max(after_point)
+    return [
+        cell + " " * (max_after_point - digits)
+        for cell, digits in zip(cells, after_point)
+    ], True
+
+
+def _format_grid_table(rows, headers):
+    """
+    Formats rows as a grid table, laid out like tabulate's "grid" format.
+
+    Args:
+        rows: List of rows, each a list of cells (numbers or preformatted strings)
+        headers: List of column headers
+
+    Returns:
+        The table as a string, with numeric columns right-aligned and text
+        columns left-aligned
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(headers)
+
+    formatted_columns = []
+    widths = []
+    right_aligned = []
+    for header, column in zip(headers, columns):
+        cells, is_numeric = _format_grid_column(column)
+        formatted_columns.append(cells)
+        # Headers get two spaces of extra room, as tabulate does
+        widths.append(max(len(header) + 2, max(map(len, cells), default=0)))
+        right_aligned.append(is_numeric)
+
+    def format_row(cells):
+        return (
+            "| "
+            + " | ".join(
+                cell.rjust(width) if right else cell.ljust(width)
+                for cell, width, right in zip(cells, widths, right_aligned)
+            )
+            + " |"
+        )
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    lines = [
+        border,
+        format_row(headers),
+        "+" + "+".join("=" * (width + 2) for width in widths) + "+",
+    ]
+    for row in zip(*formatted_columns):
+        lines.append(format_row(row))
+        lines.append(border)
+    if not rows:
+        lines.append(border)
+    return "\n".join(lines)
+
+
+def _format_row(row_format, values):
+    """Formats a table row from one of the row templates into its list of cells."""
+    return (row_format % values).split(_CELL_SEPARATOR)
+
+
+def _model_row(model, stats):
+    """Builds a model breakdown table row."""
+    return _format_row(
+        _MODEL_ROW_FORMAT,
+        (
+            model,
+            stats["message_count"],
+            f"{stats['total_tokens']:,}",
+            stats["total_cost"],
+            stats["percentage_of_total_cost"],
+            stats["avg_cost_per_message"],
+        ),
+    )
+
+
+def _verbose_model_row(model, stats):
+    """Builds a model breakdown table row with token and rate details."""
+    return _format_row(
+        _VERBOSE_MODEL_ROW_FORMAT,
+        (
+            model,
+            stats["message_count"],
+            f"{stats['total_input_tokens']:,}",
+            f"{stats['total_output_tokens']:,}",
+            f"{stats['total_tokens']:,}",
+            stats["input_cost_rate"],
+            stats["output_cost_rate"],
+            stats["total_cost"],
+            stats["percentage_of_total_cost"],
+            stats["avg_tokens_per_message"],
+            stats["avg_cost_per_message"],
+        ),
+    )
+
+
+def _day_row(day, stats):
+    """Builds a daily breakdown table row."""
+    return _format_row(
+        _DAY_ROW_FORMAT,
+        (
+            day,
+            stats["conversation_count"],
+            stats.get("total_turns", 0),
+            f"{stats['total_tokens']:,}",
+            stats["total_cost"],
+            stats.get("avg_turns_per_conversation", 0),
+            stats["avg_cost_per_conversation"],
+        ),
+    )
+
+
+def _verbose_day_row(day, stats):
+    """Builds a daily breakdown table row with token and message details."""
+    return _format_row(
+        _VERBOSE_DAY_ROW_FORMAT,
+        (
+            day,
+            stats["conversation_count"],
+            stats.get("total_turns", 0),
+            stats.get("total_assistant_messages", 0),
+            f"{stats['total_input_tokens']:,}",
+            f"{stats['total_output_tokens']:,}",
+            f"{stats['total_tokens']:,}",
+            stats["total_cost"],
+            stats["avg_tokens_per_conversation"],
+            stats.get("avg_turns_per_conversation", 0),
+            stats["avg_cost_per_conversation"],
+        ),
+    )
+
+
+def _models_by_cost(model_breakdown):
+    """Returns the (model, stats) pairs of a model breakdown, highest total cost first."""
+    return sorted(
+        model_breakdown.items(), key=lambda item: item[1]["total_cost"], reverse=True
+    )
+
+
+def _top_days_by_cost(temporal_analysis, count=10):
+    """Returns the (day, stats) pairs of the most expensive days, highest cost first."""
+    return heapq.nlargest(
+        count, temporal_analysis.items(), key=lambda item: item[1]["total_cost"]
+    )
+
+
+def _result_day(result):
+    """
+    Returns the local creation day (YYYY-MM-DD) of an analysis result, reusing the
+    create_date the analyzer already formatted when it is present.
+    """
+    return (
+        result.get("create_date")
+        or datetime.date.fromtimestamp(result["create_time_ts"]).isoformat()
+    )
+
 
 def generate_comprehensive_report(
     all_analysis_results,
@@ -25,7 +306,8 @@ def generate_comprehensive_report(
     Generates a comprehensive report based on analysis results.
 
     Args:
-        all_analysis_results: List of analysis results for each conversation
+        all_analysis_results: List of analysis results for each conversation, as
+            returned by analyze_conversation_tokens_and_costs
         current_calculation_mode: The calculation mode used (detailed or simple)
         filter_params: Dictionary containing filter parameters used for the analysis
         export_format: Format to export the report (csv, json, text)
@@ -59,27 +341,64 @@ def generate_comprehensive_report(
     # Get valid conversations (without errors)
     valid_results = [result for result in all_analysis_results if "error" not in result]
 
-    # Calculate global summary
-    if current_calculation_mode == "detailed":
-        total_input_tokens = sum(
-            result.get("total_input_tokens_across_turns", 0) for result in valid_results
-        )
-        total_output_tokens = sum(
-            result.get("total_output_tokens_for_all_assistant_msgs", 0)
-            for result in valid_results
-        )
-        total_cost = sum(result.get("total_cost", 0) for result in valid_results)
+    # Model breakdown and temporal analysis (by day). Entries are created with
+    # _new_model_stats / _new_day_stats the first time a model or day is seen.
+    model_stats = {}
+    daily_stats = {}
 
-        # Use real turns count when available, fall back to assistant message count
-        total_turns = sum(
-            result.get("real_turns_count", result.get("assistant_messages_count", 0))
-            for result in valid_results
-        )
+    # The global summary, model breakdown and daily stats are all accumulated in
+    # a single pass over the results
+    conversation_count = len(valid_results)
+    if current_calculation_mode == "detailed":
+        total_input_tokens = 0
+        total_output_tokens = 0
+        total_cost = 0
+        total_turns = 0
+        total_assistant_messages = 0
+
+        for result in valid_results:
+            (
+                input_tokens,
+                output_tokens,
+                cost,
+                turns,
+                assistant_messages,
+                turns_details,
+            ) = _detailed_result_fields(result)
+
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_cost += cost
+            total_turns += turns
+            # Also calculate total assistant messages for comparison
+            total_assistant_messages += assistant_messages
 
-        # Also calculate total assistant messages for comparison
-        total_assistant_messages = sum(
-            result.get("assistant_messages_count", 0) for result in valid_results
-        )
+            # For detailed mode, extract model information from each turn
+            for turn in turns_details:
+                model, turn_input, turn_output, turn_cost = _turn_fields(turn)
+                stats = model_stats.get(model)
+                if stats is None:
+                    # Pricing information from the cost config is set once, when the
+                    # model is first seen
+                    stats = model_stats[model] = _new_model_stats(
+                        *_MODEL_COST_RATES.get(model, (0.0, 0.0))
+                    )
+                stats["message_count"] += 1
+                stats["total_input_tokens"] += turn_input
+                stats["total_output_tokens"] += turn_output
+                stats["total_cost"] += turn_cost
+
+            if result.get("create_time_ts"):
+                day = _result_day(result)
+                day_stats = daily_stats.get(day)
+                if day_stats is None:
+                    day_stats = daily_stats[day] = _new_day_stats()
+                day_stats["conversation_count"] += 1
+                day_stats["total_input_tokens"] += input_tokens
+                day_stats["total_output_tokens"] += output_tokens
+                day_stats["total_cost"] += cost
+                day_stats["total_turns"] += turns
+                day_stats["total_assistant_messages"] += assistant_messages
 
         report["summary"] = {
             "total_input_tokens": total_input_tokens,
@@ -89,46 +408,79 @@ def generate_comprehensive_report(
             "total_turns": total_turns,
             "total_assistant_messages": total_assistant_messages,
             "avg_tokens_per_conversation": (
-                (total_input_tokens + total_output_tokens) / len(valid_results)
-                if valid_results
+                (total_input_tokens + total_output_tokens) / conversation_count
+                if conversation_count
                 else 0
             ),
             "avg_cost_per_conversation": (
-                total_cost / len(valid_results) if valid_results else 0
+                total_cost / conversation_count if conversation_count else 0
             ),
             "avg_turns_per_conversation": (
-                total_turns / len(valid_results) if valid_results else 0
+                total_turns / conversation_count if conversation_count else 0
             ),
             "avg_messages_per_conversation": (
-                total_assistant_messages / len(valid_results) if valid_results else 0
+                total_assistant_messages / conversation_count
+                if conversation_count
+                else 0
             ),
         }
     elif current_calculation_mode == "simple":
-        total_user_tokens = sum(
-            result.get("simple_total_user_tokens", 0) for result in valid_results
-        )
-        total_assistant_tokens = sum(
-            result.get("simple_total_assistant_tokens", 0) for result in valid_results
-        )
-        total_system_tokens = sum(
-            result.get("simple_total_system_tokens", 0) for result in valid_results
-        )
-        total_input_tokens = sum(
-            result.get("simple_total_input_tokens", 0) for result in valid_results
-        )
-        total_output_tokens = sum(
-            result.get("simple_total_output_tokens", 0) for result in valid_results
-        )
-        total_input_cost = sum(
-            result.get("simple_input_cost", 0) for result in valid_results
-        )
-        total_output_cost = sum(
-            result.get("simple_output_cost", 0) for result in valid_results
-        )
-        total_cost = sum(result.get("simple_total_cost", 0) for result in valid_results)
-
-        # Use real turns count when available
-        total_turns = sum(result.get("real_turns_count", 0) for result in valid_results)
+        total_user_tokens = 0
+        total_assistant_tokens = 0
+        total_system_tokens = 0
+        total_input_tokens = 0
+        total_output_tokens = 0
+        total_input_cost = 0
+        total_output_cost = 0
+        total_cost = 0
+        total_turns = 0
+
+        for result in valid_results:
+            (
+                user_tokens,
+                assistant_tokens,
+                system_tokens,
+                input_tokens,
+                output_tokens,
+                input_cost,
+                output_cost,
+                cost,
+                turns,
+                model,  # For simple mode, model is stored at conversation level
+            ) = _simple_result_fields(result)
+
+            total_user_tokens += user_tokens
+            total_assistant_tokens += assistant_tokens
+            total_system_tokens += system_tokens
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_input_cost += input_cost
+            total_output_cost += output_cost
+            total_cost += cost
+            total_turns += turns
+
+            stats = model_stats.get(model)
+            if stats is None:
+                # Pricing information from the cost config is set once, when the
+                # model is first seen
+                stats = model_stats[model] = _new_model_stats(
+                    *_MODEL_COST_RATES.get(model, (0.0, 0.0))
+                )
+            stats["message_count"] += 1
+            stats["total_input_tokens"] += input_tokens
+            stats["total_output_tokens"] += output_tokens
+            stats["total_cost"] += cost
+
+            if result.get("create_time_ts"):
+                day = _result_day(result)
+                day_stats = daily_stats.get(day)
+                if day_stats is None:
+                    day_stats = daily_stats[day] = _new_day_stats()
+                day_stats["conversation_count"] += 1
+                day_stats["total_input_tokens"] += input_tokens
+                day_stats["total_output_tokens"] += output_tokens
+                day_stats["total_cost"] += cost
+                day_stats["total_turns"] += turns
 
         report["summary"] = {
             "total_user_tokens": total_user_tokens,
@@ -142,98 +494,18 @@ def generate_comprehensive_report(
             "total_cost": total_cost,
             "total_turns": total_turns,
             "avg_tokens_per_conversation": (
-                (total_input_tokens + total_output_tokens) / len(valid_results)
-                if valid_results
+                (total_input_tokens + total_output_tokens) / conversation_count
+                if conversation_count
                 else 0
             ),
             "avg_cost_per_conversation": (
-                total_cost / len(valid_results) if valid_results else 0
+                total_cost / conversation_count if conversation_count else 0
             ),
             "avg_turns_per_conversation": (
-                total_turns / len(valid_results) if valid_results else 0
+                total_turns / conversation_count if conversation_count else 0
             ),
         }
 
-    # Model breakdown analysis
-    model_stats = defaultdict(
-        lambda: {
-            "message_count": 0,
-            "total_input_tokens": 0,
-            "total_output_tokens": 0,
-            "total_cost": 0,
-            "input_cost_rate": 0.0,
-            "output_cost_rate": 0.0,
-        }
-    )
-
-    # Add pricing information from the cost config
-    for model_name, cost_info in DEFAULT_MODEL_COSTS.items():
-        if model_name in model_stats:
-            model_stats[model_name]["input_cost_rate"] = cost_info.get(
-                "input_cost_per_million_tokens", 0.0
-            )
-            model_stats[model_name]["output_cost_rate"] = cost_info.get(
-                "output_cost_per_million_tokens", 0.0
-            )
-
-    for result in valid_results:
-        if current_calculation_mode == "detailed":
-            # For detailed mode, extract model information from each turn
-            turns = result.get("turns_details", [])
-            for turn in turns:
-                model = turn.get("model_slug", "unknown")
-                model_stats[model]["message_count"] = (
-                    model_stats[model].get("message_count", 0) + 1
-                )
-                model_stats[model]["total_input_tokens"] = model_stats[model].get(
-                    "total_input_tokens", 0
-                ) + turn.get("input_tokens", 0)
-                model_stats[model]["total_output_tokens"] = model_stats[model].get(
-                    "total_output_tokens", 0
-                ) + turn.get("output_tokens", 0)
-                model_stats[model]["total_cost"] = model_stats[model].get(
-                    "total_cost", 0
-                ) + turn.get("turn_total_cost", 0)
-
-                # Get model cost rates if not already set
-                if (
-                    model_stats[model].get("input_cost_rate", 0) == 0
-                    and model in DEFAULT_MODEL_COSTS
-                ):
-                    model_stats[model]["input_cost_rate"] = DEFAULT_MODEL_COSTS[
-                        model
-                    ].get("input_cost_per_million_tokens", 0.0)
-                    model_stats[model]["output_cost_rate"] = DEFAULT_MODEL_COSTS[
-                        model
-                    ].get("output_cost_per_million_tokens", 0.0)
-        elif current_calculation_mode == "simple":
-            # For simple mode, model is generally stored at conversation level
-            model = result.get("simple_cost_model_key", "unknown")
-            model_stats[model]["message_count"] = (
-                model_stats[model].get("message_count", 0) + 1
-            )
-            model_stats[model]["total_input_tokens"] = model_stats[model].get(
-                "total_input_tokens", 0
-            ) + result.get("simple_total_input_tokens", 0)
-            model_stats[model]["total_output_tokens"] = model_stats[model].get(
-                "total_output_tokens", 0
-            ) + result.get("simple_total_output_tokens", 0)
-            model_stats[model]["total_cost"] = model_stats[model].get(
-                "total_cost", 0
-            ) + result.get("simple_total_cost", 0)
-
-            # Get model cost rates if not already set
-            if (
-                model_stats[model].get("input_cost_rate", 0) == 0
-                and model in DEFAULT_MODEL_COSTS
-            ):
-                model_stats[model]["input_cost_rate"] = DEFAULT_MODEL_COSTS[model].get(
-                    "input_cost_per_million_tokens", 0.0
-                )
-                model_stats[model]["output_cost_rate"] = DEFAULT_MODEL_COSTS[model].get(
-                    "output_cost_per_million_tokens", 0.0
-                )
-
     # Calculate percentages and averages for model stats
     total_all_models_cost = sum(model["total_cost"] for model in model_stats.values())
 
@@ -258,49 +530,7 @@ def generate_comprehensive_report(
             stats["total_input_tokens"] + stats["total_output_tokens"]
         )
 
-    report["model_breakdown"] = dict(model_stats)
-
-    # Temporal analysis (by day)
-    daily_stats = defaultdict(
-        lambda: {
-            "conversation_count": 0,
-            "total_input_tokens": 0,
-            "total_output_tokens": 0,
-            "total_cost": 0,
-            "total_turns": 0,
-            "total_assistant_messages": 0,
-        }
-    )
-
-    for result in valid_results:
-        if result.get("create_time_ts"):
-            day = datetime.datetime.fromtimestamp(result["create_time_ts"]).strftime(
-                "%Y-%m-%d"
-            )
-
-            if current_calculation_mode == "detailed":
-                daily_stats[day]["conversation_count"] += 1
-                daily_stats[day]["total_input_tokens"] += result.get(
-                    "total_input_tokens_across_turns", 0
-                )
-                daily_stats[day]["total_output_tokens"] += result.get(
-                    "total_output_tokens_for_all_assistant_msgs", 0
-                )
-                daily_stats[day]["total_cost"] += result.get("total_cost", 0)
-                daily_stats[day]["total_turns"] += result.get("real_turns_count", 0)
-                daily_stats[day]["total_assistant_messages"] += result.get(
-                    "assistant_messages_count", 0
-                )
-            elif current_calculation_mode == "simple":
-                daily_stats[day]["conversation_count"] += 1
-                daily_stats[day]["total_input_tokens"] += result.get(
-                    "simple_total_input_tokens", 0
-                )
-                daily_stats[day]["total_output_tokens"] += result.get(
-                    "simple_total_output_tokens", 0
-                )
-                daily_stats[day]["total_cost"] += result.get("simple_total_cost", 0)
-                daily_stats[day]["total_turns"] += result.get("real_turns_count", 0)
+    report["model_breakdown"] = model_stats
 
     # Calculate daily averages
     for day, stats in daily_stats.items():
@@ -345,39 +575,55 @@ def export_report(report, format_type):
         format_type: The format to export (csv, json, text)
     """
     # Create reports directory if it doesn't exist
-    if not os.path.exists(REPORT_DIRECTORY):
-        os.makedirs(REPORT_DIRECTORY)
+    os.makedirs(REPORT_DIRECTORY, exist_ok=True)
 
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Every exported file shares this path prefix and timestamp
+    path_prefix = os.path.join(REPORT_DIRECTORY, "token_analysis")
     verbose = report["metadata"]["verbose"]
 
     if format_type == "json":
-        filename = os.path.join(
-            REPORT_DIRECTORY, f"token_analysis_report_{timestamp}.json"
-        )
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, default=str)
+        filename = f"{path_prefix}_report_{timestamp}.json"
+        if orjson is not None:
+            with open(filename, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        report,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                        default=str,
+                    )
+                )
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=str)
         print(f"Report exported to {filename}")
 
     elif format_type == "csv":
         # Export summary
-        summary_filename = os.path.join(
-            REPORT_DIRECTORY, f"token_analysis_summary_{timestamp}.csv"
-        )
-        with open(summary_filename, "w", encoding="utf-8", newline="") as f:
+        summary_filename = f"{path_prefix}_summary_{timestamp}.csv"
+        with open(
+            summary_filename,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=_CSV_BUFFER_SIZE,
+        ) as f:
             writer = csv.writer(f)
             writer.writerow(["Metric", "Value"])
-            for key, value in report["summary"].items():
-                if isinstance(value, float):
-                    writer.writerow([key, f"{value:.2f}"])
-                else:
-                    writer.writerow([key, value])
+            writer.writerows(
+                (key, f"{value:.2f}" if isinstance(value, float) else value)
+                for key, value in report["summary"].items()
+            )
 
         # Export model breakdown
-        model_filename = os.path.join(
-            REPORT_DIRECTORY, f"token_analysis_models_{timestamp}.csv"
-        )
-        with open(model_filename, "w", encoding="utf-8", newline="") as f:
+        model_filename = f"{path_prefix}_models_{timestamp}.csv"
+        with open(
+            model_filename,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=_CSV_BUFFER_SIZE,
+        ) as f:
             writer = csv.writer(f)
 
             if verbose:
@@ -394,6 +640,22 @@ def export_report(report, format_type):
                     "Avg Tokens/Msg",
                     "Avg Cost/Msg",
                 ]
+                rows = (
+                    (
+                        model,
+                        stats["message_count"],
+                        stats["total_input_tokens"],
+                        stats["total_output_tokens"],
+                        stats["total_tokens"],
+                        f"${stats['input_cost_rate']:.2f}",
+                        f"${stats['output_cost_rate']:.2f}",
+                        f"{stats['total_cost']:.2f}",
+                        f"{stats['percentage_of_total_cost']:.2f}%",
+                        f"{stats['avg_tokens_per_message']:.2f}",
+                        f"{stats['avg_cost_per_message']:.2f}",
+                    )
+                    for model, stats in report["model_breakdown"].items()
+                )
             else:
                 headers = [
                     "Model",
@@ -403,43 +665,30 @@ def export_report(report, format_type):
                     "% of Total Cost",
                     "Avg Cost/Msg",
                 ]
+                rows = (
+                    (
+                        model,
+                        stats["message_count"],
+                        stats["total_tokens"],
+                        f"{stats['total_cost']:.2f}",
+                        f"{stats['percentage_of_total_cost']:.2f}%",
+                        f"{stats['avg_cost_per_message']:.2f}",
+                    )
+                    for model, stats in report["model_breakdown"].items()
+                )
 
             writer.writerow(headers)
-
-            for model, stats in report["model_breakdown"].items():
-                if verbose:
-                    writer.writerow(
-                        [
-                            model,
-                            stats["message_count"],
-                            stats["total_input_tokens"],
-                            stats["total_output_tokens"],
-                            stats["total_tokens"],
-                            f"${stats['input_cost_rate']:.2f}",
-                            f"${stats['output_cost_rate']:.2f}",
-                            f"{stats['total_cost']:.2f}",
-                            f"{stats['percentage_of_total_cost']:.2f}%",
-                            f"{stats['avg_tokens_per_message']:.2f}",
-                            f"{stats['avg_cost_per_message']:.2f}",
-                        ]
-                    )
-                else:
-                    writer.writerow(
-                        [
-                            model,
-                            stats["message_count"],
-                            stats["total_tokens"],
-                            f"{stats['total_cost']:.2f}",
-                            f"{stats['percentage_of_total_cost']:.2f}%",
-                            f"{stats['avg_cost_per_message']:.2f}",
-                        ]
-                    )
+            writer.writerows(rows)
 
         # Export daily stats
-        daily_filename = os.path.join(
-            REPORT_DIRECTORY, f"token_analysis_daily_{timestamp}.csv"
-        )
-        with open(daily_filename, "w", encoding="utf-8", newline="") as f:
+        daily_filename = f"{path_prefix}_daily_{timestamp}.csv"
+        with open(
+            daily_filename,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=_CSV_BUFFER_SIZE,
+        ) as f:
             writer = csv.writer(f)
 
             if verbose:
@@ -456,6 +705,22 @@ def export_report(report, format_type):
                     "Avg Turns/Conv",
                     "Avg Cost/Conv",
                 ]
+                rows = (
+                    (
+                        day,
+                        stats["conversation_count"],
+                        stats.get("total_turns", 0),
+                        stats.get("total_assistant_messages", 0),
+                        f"{stats['total_input_tokens']:,}",
+                        f"{stats['total_output_tokens']:,}",
+                        f"{stats['total_tokens']:,}",
+                        f"${stats['total_cost']:.2f}",
+                        f"{stats['avg_tokens_per_conversation']:.2f}",
+                        f"{stats.get('avg_turns_per_conversation', 0):.2f}",
+                        f"${stats['avg_cost_per_conversation']:.2f}",
+                    )
+                    for day, stats in report["temporal_analysis"].items()
+                )
             else:
                 headers = [
                     "Date",
@@ -466,248 +731,166 @@ def export_report(report, format_type):
                     "Avg Turns/Conv",
                     "Avg Cost/Conv",
                 ]
+                rows = (
+                    (
+                        day,
+                        stats["conversation_count"],
+                        stats.get("total_turns", 0),
+                        f"{stats['total_tokens']:,}",
+                        f"${stats['total_cost']:.2f}",
+                        f"{stats.get('avg_turns_per_conversation', 0):.2f}",
+                        f"${stats['avg_cost_per_conversation']:.2f}",
+                    )
+                    for day, stats in report["temporal_analysis"].items()
+                )
 
             writer.writerow(headers)
-
-            for day, stats in report["temporal_analysis"].items():
-                if verbose:
-                    writer.writerow(
-                        [
-                            day,
-                            stats["conversation_count"],
-                            stats.get("total_turns", 0),
-                            stats.get("total_assistant_messages", 0),
-                            f"{stats['total_input_tokens']:,}",
-                            f"{stats['total_output_tokens']:,}",
-                            f"{stats['total_tokens']:,}",
-                            f"${stats['total_cost']:.2f}",
-                            f"{stats['avg_tokens_per_conversation']:.2f}",
-                            f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                            f"${stats['avg_cost_per_conversation']:.2f}",
-                        ]
-                    )
-                else:
-                    writer.writerow(
-                        [
-                            day,
-                            stats["conversation_count"],
-                            stats.get("total_turns", 0),
-                            f"{stats['total_tokens']:,}",
-                            f"${stats['total_cost']:.2f}",
-                            f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                            f"${stats['avg_cost_per_conversation']:.2f}",
-                        ]
-                    )
+            writer.writerows(rows)
 
         print(f"Reports exported to {REPORT_DIRECTORY}")
 
     elif format_type == "text":
-        filename = os.path.join(
-            REPORT_DIRECTORY, f"token_analysis_report_{timestamp}.txt"
+        filename = f"{path_prefix}_report_{timestamp}.txt"
+        # Collect the report text and write it to the file in a single call
+        parts = []
+        write = parts.append
+
+        # Write header
+        write("=" * 80 + "\n")
+        write(f"TOKEN USAGE ANALYSIS REPORT - {report['metadata']['generated_at']}\n")
+        write("=" * 80 + "\n\n")
+
+        # Write metadata
+        write("ANALYSIS PARAMETERS:\n")
+        write(f"Calculation Mode: {report['metadata']['calculation_mode']}\n")
+        write(
+            f"Total Conversations Analyzed: {report['metadata']['total_conversations']}\n"
         )
-        with open(filename, "w", encoding="utf-8") as f:
-            # Write header
-            f.write("=" * 80 + "\n")
-            f.write(
-                f"TOKEN USAGE ANALYSIS REPORT - {report['metadata']['generated_at']}\n"
-            )
-            f.write("=" * 80 + "\n\n")
+        write(f"Verbose Mode: {'Enabled' if verbose else 'Disabled'}\n")
 
-            # Write metadata
-            f.write("ANALYSIS PARAMETERS:\n")
-            f.write(f"Calculation Mode: {report['metadata']['calculation_mode']}\n")
-            f.write(
-                f"Total Conversations Analyzed: {report['metadata']['total_conversations']}\n"
-            )
-            f.write(f"Verbose Mode: {'Enabled' if verbose else 'Disabled'}\n")
-
-            if report["metadata"]["filters"]:
-                f.write("Filters Applied:\n")
-                for filter_name, filter_value in report["metadata"]["filters"].items():
-                    f.write(f"  {filter_name}: {filter_value}\n")
-            f.write("\n")
-
-            # Write summary
-            f.write("SUMMARY STATISTICS:\n")
-            f.write("-" * 80 + "\n")
-
-            for key, value in report["summary"].items():
-                if isinstance(value, float):
-                    f.write(f"{key.replace('_', ' ').title()}: {value:,.2f}\n")
-                else:
-                    f.write(f"{key.replace('_', ' ').title()}: {value:,}\n")
-            f.write("\n")
-
-            # Write model breakdown
-            f.write("MODEL BREAKDOWN:\n")
-            f.write("-" * 80 + "\n")
-            f.write("Note: Model identifiers explanation:\n")
-            f.write(
-                "  - Standard model names (o3, gpt-4-5, etc.) are direct model identifiers\n"
-            )
-            f.write(
-                "  - 'N/A' indicates messages where no model was specified in metadata\n"
-            )
-            f.write("  - 'Tool: X' indicates messages sent to tool endpoints\n")
-            f.write(
-                "  - Models with '(default)' suffix were not directly specified but inferred from defaults\n"
-            )
-            f.write("\n")
-
-            # Create table data for models
-            model_table = []
-            for model, stats in report["model_breakdown"].items():
-                if verbose:
-                    model_table.append(
-                        [
-                            model,
-                            stats["message_count"],
-                            f"{stats['total_input_tokens']:,}",
-                            f"{stats['total_output_tokens']:,}",
-                            f"{stats['total_tokens']:,}",
-                            f"${stats['input_cost_rate']:.2f}",
-                            f"${stats['output_cost_rate']:.2f}",
-                            f"${stats['total_cost']:.2f}",
-                            f"{stats['percentage_of_total_cost']:.2f}%",
-                            f"{stats['avg_tokens_per_message']:.2f}",
-                            f"${stats['avg_cost_per_message']:.2f}",
-                        ]
-                    )
-                else:
-                    model_table.append(
-                        [
-                            model,
-                            stats["message_count"],
-                            f"{stats['total_tokens']:,}",
-                            f"${stats['total_cost']:.2f}",
-                            f"{stats['percentage_of_total_cost']:.2f}%",
-                            f"${stats['avg_cost_per_message']:.2f}",
-                        ]
-                    )
+        if report["metadata"]["filters"]:
+            write("Filters Applied:\n")
+            for filter_name, filter_value in report["metadata"]["filters"].items():
+                write(f"  {filter_name}: {filter_value}\n")
+        write("\n")
+
+        # Write summary
+        write("SUMMARY STATISTICS:\n")
+        write("-" * 80 + "\n")
+
+        for key, value in report["summary"].items():
+            if isinstance(value, float):
+                write(f"{key.replace('_', ' ').title()}: {value:,.2f}\n")
+            else:
+                write(f"{key.replace('_', ' ').title()}: {value:,}\n")
+        write("\n")
+
+        # Write model breakdown
+        write("MODEL BREAKDOWN:\n")
+        write("-" * 80 + "\n")
+        write("Note: Model identifiers explanation:\n")
+        write(
+            "  - Standard model names (o3, gpt-4-5, etc.) are direct model identifiers\n"
+        )
+        write("  - 'N/A' indicates messages where no model was specified in metadata\n")
+        write("  - 'Tool: X' indicates messages sent to tool endpoints\n")
+        write(
+            "  - Models with '(default)' suffix were not directly specified but inferred from defaults\n"
+        )
+        write("\n")
+
+        # Create table data for models, sorted by cost (descending); the row
+        # builder is picked once
+        build_model_row = _verbose_model_row if verbose else _model_row
+        model_table = [
+            build_model_row(model, stats)
+            for model, stats in _models_by_cost(report["model_breakdown"])
+        ]
+
+        if verbose:
+            headers = [
+                "Model",
+                "Messages",
+                "Input Tokens",
+                "Output Tokens",
+                "Total Tokens",
+                "Input$/M",
+                "Output$/M",
+                "Total Cost",
+                "% of Cost",
+                "Avg Tokens/Msg",
+                "Avg Cost/Msg",
+            ]
+        else:
+            headers = [
+                "Model",
+                "Messages",
+                "Total Tokens",
+                "Total Cost",
+                "% of Cost",
+                "Avg Cost/Msg",
+            ]
+
+        write(_format_grid_table(model_table, headers) + "\n\n")
+
+        # Write daily breakdown
+        if report["temporal_analysis"]:
+            write("DAILY BREAKDOWN:\n")
+            write("-" * 80 + "\n")
+
+            # Display only top 10 days, picked before any rows are formatted
+            days = report["temporal_analysis"].items()
+            if len(days) > 10:
+                write(f"(Showing top 10 of {len(days)} days)\n")
+                days = _top_days_by_cost(report["temporal_analysis"])
+
+            # Create table data for days; the row builder is picked once
+            build_day_row = _verbose_day_row if verbose else _day_row
+            day_table = [build_day_row(day, stats) for day, stats in days]
 
-            # Sort table by cost (descending)
             if verbose:
-                model_table.sort(
-                    key=lambda x: float(x[7].replace("$", "").replace(",", "")),
-                    reverse=True,
-                )
                 headers = [
-                    "Model",
-                    "Messages",
+                    "Date",
+                    "Convs",
+                    "Turns",
+                    "Msgs",
                     "Input Tokens",
                     "Output Tokens",
                     "Total Tokens",
-                    "Input$/M",
-                    "Output$/M",
                     "Total Cost",
-                    "% of Cost",
-                    "Avg Tokens/Msg",
-                    "Avg Cost/Msg",
+                    "Avg Tokens/Conv",
+                    "Avg Turns/Conv",
+                    "Avg Cost/Conv",
                 ]
             else:
-                model_table.sort(
-                    key=lambda x: float(x[3].replace("$", "").replace(",", "")),
-                    reverse=True,
-                )
                 headers = [
-                    "Model",
-                    "Messages",
+                    "Date",
+                    "Convs",
+                    "Turns",
                     "Total Tokens",
                     "Total Cost",
-                    "% of Cost",
-                    "Avg Cost/Msg",
+                    "Avg Turns/Conv",
+                    "Avg Cost/Conv",
                 ]
 
-            f.write(tabulate(model_table, headers=headers, tablefmt="grid") + "\n\n")
-
-            # Write daily breakdown
-            if report["temporal_analysis"]:
-                f.write("DAILY BREAKDOWN:\n")
-                f.write("-" * 80 + "\n")
-
-                # Create table data for days
-                day_table = []
-                for day, stats in report["temporal_analysis"].items():
-                    if verbose:
-                        day_table.append(
-                            [
-                                day,
-                                stats["conversation_count"],
-                                stats.get("total_turns", 0),
-                                stats.get("total_assistant_messages", 0),
-                                f"{stats['total_input_tokens']:,}",
-                                f"{stats['total_output_tokens']:,}",
-                                f"{stats['total_tokens']:,}",
-                                f"${stats['total_cost']:.2f}",
-                                f"{stats['avg_tokens_per_conversation']:.2f}",
-                                f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                                f"${stats['avg_cost_per_conversation']:.2f}",
-                            ]
-                        )
-                    else:
-                        day_table.append(
-                            [
-                                day,
-                                stats["conversation_count"],
-                                stats.get("total_turns", 0),
-                                f"{stats['total_tokens']:,}",
-                                f"${stats['total_cost']:.2f}",
-                                f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                                f"${stats['avg_cost_per_conversation']:.2f}",
-                            ]
-                        )
-
-                if verbose:
-                    headers = [
-                        "Date",
-                        "Convs",
-                        "Turns",
-                        "Msgs",
-                        "Input Tokens",
-                        "Output Tokens",
-                        "Total Tokens",
-                        "Total Cost",
-                        "Avg Tokens/Conv",
-                        "Avg Turns/Conv",
-                        "Avg Cost/Conv",
-                    ]
-                else:
-                    headers = [
-                        "Date",
-                        "Convs",
-                        "Turns",
-                        "Total Tokens",
-                        "Total Cost",
-                        "Avg Turns/Conv",
-                        "Avg Cost/Conv",
-                    ]
-
-                # Display only top 10 days
-                if len(day_table) > 10:
-                    f.write(f"(Showing top 10 of {len(day_table)} days)\n")
-                    day_table = sorted(
-                        day_table,
-                        key=lambda x: float(
-                            x[7 if verbose else 4].replace("$", "").replace(",", "")
-                        ),
-                        reverse=True,
-                    )[:10]
-
-                f.write(tabulate(day_table, headers=headers, tablefmt="grid") + "\n\n")
-
-            # Write errors if any
-            if report["errors"]:
-                f.write("ERRORS:\n")
-                f.write("-" * 80 + "\n")
-                for error in report["errors"]:
-                    f.write(
-                        f"Conversation: '{error.get('title', 'N/A')}' - Error: {error.get('error', 'Unknown error')}\n"
-                    )
+            write(_format_grid_table(day_table, headers) + "\n\n")
 
-            f.write("\n")
-            f.write("=" * 80 + "\n")
-            f.write("End of Report\n")
-            f.write("=" * 80 + "\n")
+        # Write errors if any
+        if report["errors"]:
+            write("ERRORS:\n")
+            write("-" * 80 + "\n")
+            for error in report["errors"]:
+                write(
+                    f"Conversation: '{error.get('title', 'N/A')}' - Error: {error.get('error', 'Unknown error')}\n"
+                )
+
+        write("\n")
+        write("=" * 80 + "\n")
+        write("End of Report\n")
+        write("=" * 80 + "\n")
+
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
 
         print(f"Report exported to {filename}")
 
@@ -717,77 +900,53 @@ def export_report(report, format_type):
 
 def print_report_to_console(report):
     """
-    Prints a formatted report to the console.
+    Prints a formatted report to the console with a single write.
 
     Args:
         report: The report data to print
     """
     verbose = report["metadata"]["verbose"]
 
+    # The report is collected in parts and written to stdout in one call
+    parts = []
+    write = parts.append
+
     # Print header
-    print("\n" + "=" * 80)
-    print(f"TOKEN USAGE ANALYSIS REPORT - {report['metadata']['generated_at']}")
-    print("=" * 80 + "\n")
+    write("\n" + "=" * 80 + "\n")
+    write(f"TOKEN USAGE ANALYSIS REPORT - {report['metadata']['generated_at']}\n")
+    write("=" * 80 + "\n\n")
 
     # Print summary
-    print("SUMMARY STATISTICS:")
-    print("-" * 80)
+    write("SUMMARY STATISTICS:\n")
+    write("-" * 80 + "\n")
 
     for key, value in report["summary"].items():
         if isinstance(value, float):
-            print(f"{key.replace('_', ' ').title()}: {value:,.2f}")
+            write(f"{key.replace('_', ' ').title()}: {value:,.2f}\n")
         else:
-            print(f"{key.replace('_', ' ').title()}: {value:,}")
-    print()
+            write(f"{key.replace('_', ' ').title()}: {value:,}\n")
+    write("\n")
 
     # Print model breakdown
-    print("MODEL BREAKDOWN:")
-    print("-" * 80)
-    print("Note: Model identifiers explanation:")
-    print("  - Standard model names (o3, gpt-4-5, etc.) are direct model identifiers")
-    print("  - 'N/A' indicates messages where no model was specified in metadata")
-    print("  - 'Tool: X' indicates messages sent to tool endpoints")
-    print(
-        "  - Models with '(default)' suffix were not directly specified but inferred from defaults"
+    write("MODEL BREAKDOWN:\n")
+    write("-" * 80 + "\n")
+    write("Note: Model identifiers explanation:\n")
+    write("  - Standard model names (o3, gpt-4-5, etc.) are direct model identifiers\n")
+    write("  - 'N/A' indicates messages where no model was specified in metadata\n")
+    write("  - 'Tool: X' indicates messages sent to tool endpoints\n")
+    write(
+        "  - Models with '(default)' suffix were not directly specified but inferred from defaults\n"
     )
-    print()
+    write("\n")
 
-    # Create table data for models
-    model_table = []
-    for model, stats in report["model_breakdown"].items():
-        if verbose:
-            model_table.append(
-                [
-                    model,
-                    stats["message_count"],
-                    f"{stats['total_input_tokens']:,}",
-                    f"{stats['total_output_tokens']:,}",
-                    f"{stats['total_tokens']:,}",
-                    f"${stats['input_cost_rate']:.2f}",
-                    f"${stats['output_cost_rate']:.2f}",
-                    f"${stats['total_cost']:.2f}",
-                    f"{stats['percentage_of_total_cost']:.2f}%",
-                    f"{stats['avg_tokens_per_message']:.2f}",
-                    f"${stats['avg_cost_per_message']:.2f}",
-                ]
-            )
-        else:
-            model_table.append(
-                [
-                    model,
-                    stats["message_count"],
-                    f"{stats['total_tokens']:,}",
-                    f"${stats['total_cost']:.2f}",
-                    f"{stats['percentage_of_total_cost']:.2f}%",
-                    f"${stats['avg_cost_per_message']:.2f}",
-                ]
-            )
+    # Create table data for models, sorted by cost (descending)
+    build_model_row = _verbose_model_row if verbose else _model_row
+    model_table = [
+        build_model_row(model, stats)
+        for model, stats in _models_by_cost(report["model_breakdown"])
+    ]
 
-    # Sort table by cost (descending)
     if verbose:
-        model_table.sort(
-            key=lambda x: float(x[7].replace("$", "").replace(",", "")), reverse=True
-        )
         headers = [
             "Model",
             "Messages",
@@ -802,9 +961,6 @@ def print_report_to_console(report):
             "Avg Cost/Msg",
         ]
     else:
-        model_table.sort(
-            key=lambda x: float(x[3].replace("$", "").replace(",", "")), reverse=True
-        )
         headers = [
             "Model",
             "Messages",
@@ -814,52 +970,25 @@ def print_report_to_console(report):
             "Avg Cost/Msg",
         ]
 
-    print(tabulate(model_table, headers=headers, tablefmt="grid"))
-    print()
+    write(_format_grid_table(model_table, headers) + "\n\n")
 
     # Print daily breakdown (top 5 days by cost)
     if report["temporal_analysis"]:
-        print("DAILY BREAKDOWN (Top Days by Cost):")
-        print("-" * 80)
-
-        # Create table data for days
-        day_table = []
-        for day, stats in report["temporal_analysis"].items():
-            if verbose:
-                day_table.append(
-                    [
-                        day,
-                        stats["conversation_count"],
-                        stats.get("total_turns", 0),
-                        stats.get("total_assistant_messages", 0),
-                        f"{stats['total_input_tokens']:,}",
-                        f"{stats['total_output_tokens']:,}",
-                        f"{stats['total_tokens']:,}",
-                        f"${stats['total_cost']:.2f}",
-                        f"{stats['avg_tokens_per_conversation']:.2f}",
-                        f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                        f"${stats['avg_cost_per_conversation']:.2f}",
-                    ]
-                )
-            else:
-                day_table.append(
-                    [
-                        day,
-                        stats["conversation_count"],
-                        stats.get("total_turns", 0),
-                        f"{stats['total_tokens']:,}",
-                        f"${stats['total_cost']:.2f}",
-                        f"{stats.get('avg_turns_per_conversation', 0):.2f}",
-                        f"${stats['avg_cost_per_conversation']:.2f}",
-                    ]
-                )
+        write("DAILY BREAKDOWN (Top Days by Cost):\n")
+        write("-" * 80 + "\n")
+
+        # Display only top 10 days, picked before any rows are formatted
+        if len(report["temporal_analysis"]) > 10:
+            write(f"(Showing top 10 of {len(report['temporal_analysis'])} days)\n")
+
+        # Create table data for days, sorted by cost (descending)
+        build_day_row = _verbose_day_row if verbose else _day_row
+        day_table = [
+            build_day_row(day, stats)
+            for day, stats in _top_days_by_cost(report["temporal_analysis"])
+        ]
 
-        # Sort by cost (descending)
         if verbose:
-            day_table.sort(
-                key=lambda x: float(x[7].replace("$", "").replace(",", "")),
-                reverse=True,
-            )
             headers = [
                 "Date",
                 "Convs",
@@ -874,10 +1003,6 @@ def print_report_to_console(report):
                 "Avg Cost/Conv",
             ]
         else:
-            day_table.sort(
-                key=lambda x: float(x[4].replace("$", "").replace(",", "")),
-                reverse=True,
-            )
             headers = [
                 "Date",
                 "Convs",
@@ -888,20 +1013,16 @@ def print_report_to_console(report):
                 "Avg Cost/Conv",
             ]
 
-        # Display only top 10 days
-        if len(day_table) > 10:
-            print(f"(Showing top 10 of {len(day_table)} days)")
-            day_table = day_table[:10]
-
-        print(tabulate(day_table, headers=headers, tablefmt="grid"))
-        print()
+        write(_format_grid_table(day_table, headers) + "\n\n")
 
     # Print errors if any
     if report["errors"]:
-        print("ERRORS:")
-        print("-" * 80)
+        write("ERRORS:\n")
+        write("-" * 80 + "\n")
         for error in report["errors"]:
-            print(
-                f"Conversation: '{error.get('title', 'N/A')}' - Error: {error.get('error', 'Unknown error')}"
+            write(
+                f"Conversation: '{error.get('title', 'N/A')}' - Error: {error.get('error', 'Unknown error')}\n"
             )
-        print()
+        write("\n")
+
+    sys.stdout.write("".join(parts))
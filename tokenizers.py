@@ -1,11 +1,26 @@
 """Functions for token counting and message extraction."""
 
+import functools
+from collections import OrderedDict
+
 import tiktoken
 from config import THOUGHT_CONTENT_MULTIPLIER
 
+# Token counts of recently seen texts, keyed by (encoding name, text) and kept in
+# least-recently-used order. Exports repeat the same system prompts, profiles and
+# instructions across conversations, so these are encoded only once. Long texts
+# rarely repeat exactly and are not cached.
+_TOKEN_COUNT_CACHE = OrderedDict()
+_TOKEN_COUNT_CACHE_SIZE = 65536
+_MAX_CACHED_TEXT_LENGTH = 4096
+
+# Shared stand-in for a missing metadata/content dict; never mutated
+_EMPTY = {}
+
 
+@functools.lru_cache(maxsize=None)
 def get_tokenizer(model_slug=None):
-    """Gets the tiktoken tokenizer based on model_slug."""
+    """Gets the tiktoken tokenizer based on model_slug, resolving each slug only once."""
     try:
         if model_slug == "o3":
             # Assuming o3 corresponds to gpt-4o based on user example
@@ -22,74 +37,118 @@ def get_tokenizer(model_slug=None):
         return tiktoken.get_encoding("cl100k_base")
 
 
-def count_tokens(text, tokenizer):
-    """Counts tokens in a given text using the provided tokenizer.
-    Handles potential disallowed special tokens like '<|endoftext|>' by allowing them as normal text.
+# Disallowed special-token sets keyed by id(tokenizer). The tokenizer is stored with
+# its set so a recycled id can never return a stale result.
+_DISALLOWED_SPECIAL_CACHE = {}
+
+
+def _disallowed_special_tokens(tokenizer):
     """
-    if not text or not isinstance(text, str):
-        return 0
+    Returns the tokenizer's special tokens minus '<|endoftext|>', which is encoded as
+    text. The set is built once per tokenizer, as a frozenset that tiktoken uses as is.
+    """
+    cached = _DISALLOWED_SPECIAL_CACHE.get(id(tokenizer))
+    if cached is not None and cached[0] is tokenizer:
+        return cached[1]
 
-    # Allow '<|endoftext|>' to be encoded as normal text.
-    # For other special tokens, tiktoken will still raise an error if they are disallowed by default.
     disallowed_set = tokenizer.special_tokens_set
     if "<|endoftext|>" in disallowed_set:
         disallowed_set = disallowed_set - {"<|endoftext|>"}
+    disallowed_set = frozenset(disallowed_set)
+    _DISALLOWED_SPECIAL_CACHE[id(tokenizer)] = (tokenizer, disallowed_set)
+    return disallowed_set
+
+
+def _get_cached_token_count(text, tokenizer):
+    """Returns the cached token count of text for the tokenizer, or None."""
+    key = (tokenizer.name, text)
+    token_count = _TOKEN_COUNT_CACHE.get(key)
+    if token_count is not None:
+        _TOKEN_COUNT_CACHE.move_to_end(key)
+    return token_count
 
-    try:
-        return len(tokenizer.encode(text, disallowed_special=disallowed_set))
-    except ValueError as e:
-        # This might happen if other unexpected special tokens are encountered.
-        # For now, we'll print a warning and return 0 tokens for this text part.
-        # A more sophisticated handling might be needed if this occurs frequently with other tokens.
-        print(
-            f"Warning: Tokenizer error for text: '{text[:100]}...'. Error: {e}. Returning 0 tokens for this part."
-        )
-        return 0
 
+def _cache_token_count(text, tokenizer, token_count):
+    """Caches a text's token count, evicting the least recently used entry when full."""
+    if len(text) > _MAX_CACHED_TEXT_LENGTH:
+        return
+    _TOKEN_COUNT_CACHE[(tokenizer.name, text)] = token_count
+    if len(_TOKEN_COUNT_CACHE) > _TOKEN_COUNT_CACHE_SIZE:
+        _TOKEN_COUNT_CACHE.popitem(last=False)
 
-def extract_text_from_message(message_data, count_thoughts=True):
+
+def count_tokens(text, tokenizer):
+    """Counts tokens in a given text using the provided tokenizer.
+    Handles potential disallowed special tokens like '<|endoftext|>' by allowing them as normal text.
     """
-    Extracts relevant text from a message object for token counting.
-    If count_thoughts is True, applies a multiplier to tokens from thoughts[].content.
-    Tokens are counted using a tokenizer appropriate for the message's model_slug.
-    Returns a list of text pieces and their token counts.
+    if type(text) is not str or not text:
+        return 0
+
+    cached = _get_cached_token_count(text, tokenizer)
+    if cached is not None:
+        return cached
+
+    if "<|" not in text:
+        # Every special token starts with '<|', so without it there is nothing for
+        # tiktoken to scan for and the plain encoder gives the same tokens
+        token_count = len(tokenizer.encode_ordinary(text))
+    else:
+        # Allow '<|endoftext|>' to be encoded as normal text.
+        # For other special tokens, tiktoken will still raise an error if they are disallowed by default.
+        disallowed_set = _disallowed_special_tokens(tokenizer)
+
+        try:
+            token_count = len(tokenizer.encode(text, disallowed_special=disallowed_set))
+        except ValueError as e:
+            # This might happen if other unexpected special tokens are encountered.
+            # For now, we'll print a warning and return 0 tokens for this text part.
+            # A more sophisticated handling might be needed if this occurs frequently with other tokens.
+            print(
+                f"Warning: Tokenizer error for text: '{text[:100]}...'. Error: {e}. Returning 0 tokens for this part."
+            )
+            return 0
+
+    _cache_token_count(text, tokenizer, token_count)
+    return token_count
+
+
+# Content types that _iter_token_pieces yields pieces for
+_COUNTED_CONTENT_TYPES = frozenset({"text", "thoughts", "user_editable_context"})
+
+
+def _iter_token_pieces(content):
     """
-    if not message_data or not message_data.get("message"):
-        return [], 0
+    Yields the pieces of a message's content that are counted as tokens.
 
-    message = message_data["message"]
-    model_slug = message.get("metadata", {}).get("model_slug")
-    tokenizer = get_tokenizer(model_slug)  # Get tokenizer based on this message's slug
+    Args:
+        content: The message's content dict
 
-    content = message.get("content", {})
+    Returns:
+        Generator of (text, weight, is_thought) tuples; the token count of text is
+        multiplied by weight, and is_thought marks thoughts[] pieces
+    """
     content_type = content.get("content_type")
 
-    text_parts = []
-    total_tokens = 0
-
     if content_type == "text":
-        parts = content.get("parts", [])
+        parts = content.get("parts") or ()
         if parts:
-            full_text = "".join(p for p in parts if isinstance(p, str))
-            text_parts.append(full_text)
-            total_tokens += count_tokens(full_text, tokenizer)
-
-    elif content_type == "thoughts" and count_thoughts:
-        thoughts = content.get("thoughts", [])
+            # Most text messages have a single string part, which needs no join
+            if len(parts) == 1 and isinstance(parts[0], str):
+                yield parts[0], 1, False
+            else:
+                yield "".join(p for p in parts if isinstance(p, str)), 1, False
+
+    elif content_type == "thoughts":
+        thoughts = content.get("thoughts") or ()
         for thought in thoughts:
             summary_label = thought.get("summary", "")
             thought_content_text = thought.get("content", "")
 
             if summary_label:
-                total_tokens += count_tokens(summary_label, tokenizer)
-                text_parts.append(f"[Thought Label]: {summary_label}")
+                yield summary_label, 1, True
 
             if thought_content_text:
-                content_tokens = count_tokens(thought_content_text, tokenizer)
-                total_tokens += content_tokens * THOUGHT_CONTENT_MULTIPLIER
-                text_parts.append(
-                    f"[Thought Content (x{THOUGHT_CONTENT_MULTIPLIER})]: {thought_content_text}"
-                )
+                yield thought_content_text, THOUGHT_CONTENT_MULTIPLIER, True
 
     elif content_type == "user_editable_context":
         # These typically set up the conversation but might not be "active" message parts for costing each turn.
@@ -97,25 +156,41 @@ def extract_text_from_message(message_data, count_thoughts=True):
         user_profile = content.get("user_profile", "")
         user_instructions = content.get("user_instructions", "")
         if user_profile:
-            total_tokens += count_tokens(user_profile, tokenizer)
-            text_parts.append(f"[User Profile]: {user_profile}")
+            yield user_profile, 1, False
         if user_instructions:
-            total_tokens += count_tokens(user_instructions, tokenizer)
-            text_parts.append(f"[User Instructions]: {user_instructions}")
+            yield user_instructions, 1, False
 
     # Add other content_types if necessary
 
-    # For role and author, also include if it's not empty or default
-    author_role = message.get("author", {}).get("role")
-    if author_role and author_role not in [
-        "system",
-        "user",
-        "assistant",
-    ]:  # if there's a custom role name
-        # This is a simple way to account for role name tokens if they are custom/long.
-        # Often role names are short and fixed, so their token count is negligible or part of model's internal prompting.
-        # text_parts.append(f"[Author Role]: {author_role}")
-        # total_tokens += count_tokens(author_role, tokenizer)
-        pass
-
-    return text_parts, total_tokens
+
+def count_message_tokens(message_data):
+    """
+    Counts a message's tokens with and without thoughts from one pass over its content.
+
+    Args:
+        message_data: A mapping node (dict with a "message" key), or None
+
+    Returns:
+        Tuple (tokens_with_thoughts, tokens_without_thoughts); thoughts[] content is
+        weighted by THOUGHT_CONTENT_MULTIPLIER
+    """
+    message = message_data.get("message") if message_data else None
+    if not message:
+        return 0, 0
+
+    content = message.get("content") or _EMPTY
+    if content.get("content_type") not in _COUNTED_CONTENT_TYPES:
+        return 0, 0  # Nothing to count, so no tokenizer lookup
+
+    model_slug = (message.get("metadata") or _EMPTY).get("model_slug")
+    tokenizer = get_tokenizer(model_slug)
+
+    # Each piece is encoded once and shared between both totals
+    tokens_with_thoughts = 0
+    tokens_without_thoughts = 0
+    for text, weight, is_thought in _iter_token_pieces(content):
+        piece_tokens = count_tokens(text, tokenizer) * weight
+        tokens_with_thoughts += piece_tokens
+        if not is_thought:
+            tokens_without_thoughts += piece_tokens
+    return tokens_with_thoughts, tokens_without_thoughts